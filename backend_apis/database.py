@@ -11,21 +11,48 @@ Expose three things:
   - ``SessionLocal``  : ``sessionmaker`` bound to that engine
   - ``get_db``        : FastAPI dependency yielding a scoped ``Session``
   - ``init_db``       : creates all tables declared on ``Base.metadata``
+  - ``pool_status``   : connection pool summary for health checks
 """
 from __future__ import annotations
 
+import json
 import os
 from typing import Iterator, Optional
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from backend_apis.models import Base
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
 
 DEFAULT_SQLITE_URL = "sqlite:///./player_connections.db"
 
+# Pool sizing for server-backed databases (Postgres). SQLite keeps its own
+# default pool since it is a single local file.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+# Recycle before typical server/proxy idle timeouts so a webhook never picks
+# up a connection that was silently dropped; fail fast instead of queueing
+# forever when the pool is exhausted.
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Applied to every new SQLite connection. WAL lets readers proceed while the
+# single writer commits, NORMAL sync is durable enough under WAL, and the
+# temp-store / mmap settings keep hot pages out of the read() path.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
 
 def resolve_database_url() -> str:
     """
@@ -43,14 +70,48 @@ def resolve_database_url() -> str:
     )
 
 
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """``connect`` event hook that applies ``SQLITE_PRAGMAS`` to a new connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def dumps_json(obj) -> str:
+    """``json_serializer`` for JSON/JSONB columns (orjson when it is installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=str)
+
+
 def build_engine(url: Optional[str] = None) -> Engine:
     db_url = url or resolve_database_url()
 
-    connect_args: dict = {}
     if db_url.startswith("sqlite"):
-        connect_args["check_same_thread"] = False
-
-    return create_engine(db_url, future=True, connect_args=connect_args)
+        eng = create_engine(
+            db_url,
+            future=True,
+            echo=False,
+            json_serializer=dumps_json,
+            connect_args={"check_same_thread": False},
+        )
+        event.listen(eng, "connect", apply_sqlite_pragmas)
+        return eng
+
+    return create_engine(
+        db_url,
+        future=True,
+        echo=False,
+        json_serializer=dumps_json,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
 
 
 engine: Engine = build_engine()
@@ -85,11 +146,40 @@ def ensure_sqlite_player_wallet_columns(eng: Engine) -> None:
             conn.execute(text(f"ALTER TABLE player_wallets ADD COLUMN {column_name} {ddl_suffix}"))
 
 
+def ensure_postgres_webhook_data_jsonb(eng: Engine) -> None:
+    """
+    Convert a pre-existing ``transactions.webhook_data`` TEXT column to JSONB.
+
+    ``create_all`` never alters existing tables, so databases created before the
+    column became JSONB are migrated in place (old rows were always JSON text).
+    """
+    if eng.dialect.name != "postgresql":
+        return
+    with eng.begin() as conn:
+        data_type = conn.execute(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'transactions' AND column_name = 'webhook_data'"
+        )).scalar()
+        if data_type is None or data_type == "jsonb":
+            return
+        conn.execute(text(
+            "ALTER TABLE transactions ALTER COLUMN webhook_data TYPE JSONB "
+            "USING webhook_data::jsonb"
+        ))
+
+
+def pool_status(target_engine: Optional[Engine] = None) -> str:
+    """Human-readable connection pool summary (checked in/out, overflow)."""
+    eng = target_engine or engine
+    return eng.pool.status()
+
+
 def init_db(target_engine: Optional[Engine] = None) -> None:
     """Create all tables declared on ``Base.metadata`` if missing."""
     eng = target_engine or engine
     Base.metadata.create_all(bind=eng)
     ensure_sqlite_player_wallet_columns(eng)
+    ensure_postgres_webhook_data_jsonb(eng)
 
 
 def get_db() -> Iterator[Session]:
@@ -10,7 +10,6 @@ This module provides:
 import uuid
 import os
 import json
-import webbrowser
 import sys
 from typing import Optional
 from dataclasses import dataclass
@@ -360,7 +359,8 @@ class BackendClient:
                     print(f"Failed to open checkout URL in browser: {e}")
                     return False
             else:
-                # On desktop, use webbrowser module
+                # On desktop, use webbrowser module (imported here: only checkout needs it)
+                import webbrowser
                 webbrowser.open(session.checkout_url)
                 return True
         
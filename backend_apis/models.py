@@ -3,20 +3,26 @@ Database models and shared constants for the payment system.
 """
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
+from types import MappingProxyType
+from typing import Mapping
 
 from sqlalchemy import (
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    JSON,
     String,
     Text,
     UniqueConstraint,
     Enum as SqlEnum,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base, relationship
 
 
@@ -54,6 +60,44 @@ PACKAGES: dict[PackageType, dict] = {
 }
 
 
+@dataclass(frozen=True)
+class PreparedPackage:
+    """
+    Request-path view of one ``PACKAGES`` entry, derived once at import.
+
+    Holds the Stripe amount in cents, the checkout line-item description and
+    the stringified metadata Stripe expects, so purchase endpoints do not
+    redo the float math and string formatting per request.
+    """
+    package_type: PackageType
+    name: str
+    price: float
+    amount_cents: int
+    gold_coins: int
+    health_packs: int
+    description: str
+    metadata: Mapping[str, str]
+
+
+PREPARED_PACKAGES: Mapping[PackageType, PreparedPackage] = MappingProxyType({
+    package_type: PreparedPackage(
+        package_type=package_type,
+        name=package["name"],
+        price=package["price"],
+        amount_cents=int(package["price"] * 100),
+        gold_coins=package["gold_coins"],
+        health_packs=package["health_packs"],
+        description=f"Gold Coins: {package['gold_coins']}, Health Packs: {package['health_packs']}",
+        metadata=MappingProxyType({
+            "package_type": package_type.value,
+            "gold_coins": str(package["gold_coins"]),
+            "health_packs": str(package["health_packs"]),
+        }),
+    )
+    for package_type, package in PACKAGES.items()
+})
+
+
 class TransactionStatus(str, Enum):
     PENDING = "pending"
     AUTHORIZED = "authorized"
@@ -142,13 +186,37 @@ class PlayerWallet(Base):
         return base
 
 
+# Columns the webhook path reads right after looking a transaction up; on
+# PostgreSQL the reference indexes INCLUDE them for index-only scans.
+TRANSACTION_LOOKUP_INCLUDE = (
+    "status",
+    "player_id",
+    "gold_coins_reward",
+    "health_packs_reward",
+    "amount_cents",
+)
+
+
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index(
+            "ix_transactions_merchant_reference",
+            "merchant_reference",
+            unique=True,
+            postgresql_include=[*TRANSACTION_LOOKUP_INCLUDE, "psp_reference"],
+        ),
+        Index(
+            "ix_transactions_psp_reference",
+            "psp_reference",
+            postgresql_include=[*TRANSACTION_LOOKUP_INCLUDE, "merchant_reference"],
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
-    merchant_reference = Column(String(128), unique=True, nullable=False, index=True)
-    psp_reference = Column(String(128), index=True)
+    merchant_reference = Column(String(128), nullable=False)
+    psp_reference = Column(String(128))
     package_type = Column(String(64), nullable=False)
     amount_cents = Column(Integer, nullable=False)
     currency = Column(String(8), nullable=False, default="USD")
@@ -156,7 +224,8 @@ class Transaction(Base):
     gold_coins_reward = Column(Integer, default=0, nullable=False)
     health_packs_reward = Column(Integer, default=0, nullable=False)
     payment_method = Column(String(64))
-    webhook_data = Column(Text)
+    # JSONB on Postgres (driver serializes the dict once); JSON text elsewhere.
+    webhook_data = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"))
     error_message = Column(Text)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
@@ -165,6 +234,20 @@ class Transaction(Base):
     player = relationship("Player", back_populates="transactions")
 
 
+class ProcessedEvent(Base):
+    """
+    Stripe event ids that have already been handled.
+
+    Stripe retries deliveries, so webhook handlers insert the event id first
+    and stop when the row already exists.
+    """
+
+    __tablename__ = "processed_events"
+
+    event_id = Column(String(255), primary_key=True)
+    processed_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+
 class PlayerIPRecord(Base):
     """
     Persistent record of the IP addresses new players connect from.
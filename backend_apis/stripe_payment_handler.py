@@ -1,23 +1,157 @@
 """
 Stripe Payment Handler - Orchestrates payment flow between Stripe and database.
 """
-import json
-from datetime import datetime, timezone
 from typing import Optional
 from dataclasses import dataclass
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, joinedload
 
 from .models import (
-    Player, PlayerWallet, Transaction, 
-    PackageType, PACKAGES, TransactionStatus
+    Player, PlayerWallet, ProcessedEvent, Transaction, 
+    PackageType, PACKAGES, PREPARED_PACKAGES, TransactionStatus
 )
 from .stripe_service import (
     StripePaymentService, 
     StripePaymentResult, 
-    StripeWebhookResult
+    StripeWebhookResult,
+    resolve_webhook_event,
 )
 
 
+# PACKAGES never changes at runtime, so the public package listing is built
+# once. Treat these dicts as read-only.
+AVAILABLE_PACKAGES: tuple[dict, ...] = tuple(
+    {
+        "id": package_type.value,
+        "name": package["name"],
+        "price_usd": package["price"],
+        "gold_coins": package["gold_coins"],
+        "health_packs": package["health_packs"],
+    }
+    for package_type, package in PACKAGES.items()
+)
+
+
+def dialect_insert(db: Session):
+    """
+    Return the dialect's ``insert`` construct when it supports ``ON CONFLICT``.
+
+    Postgres and SQLite both expose ``on_conflict_do_*``; anything else gets
+    ``None`` and callers fall back to plain ORM select-then-insert.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+def record_event_once(db: Session, event_id: Optional[str]) -> bool:
+    """
+    Claim a Stripe ``event.id`` in the caller's transaction.
+
+    Returns ``False`` when the id was already recorded (a Stripe retry), so the
+    caller can stop before any other reads or writes. Events without an id
+    are always processed.
+    """
+    if not event_id:
+        return True
+    insert = dialect_insert(db)
+    if insert is None:
+        if db.get(ProcessedEvent, event_id) is not None:
+            return False
+        db.add(ProcessedEvent(event_id=event_id))
+        db.flush()
+        return True
+    result = db.execute(
+        insert(ProcessedEvent)
+        .values(event_id=event_id)
+        .on_conflict_do_nothing(index_elements=[ProcessedEvent.event_id])
+    )
+    return result.rowcount != 0
+
+
+def lock_transaction_for_credit(db: Session, transaction: Transaction) -> bool:
+    """
+    Take the row lock that makes crediting ``transaction`` single-winner.
+
+    Uses ``SELECT ... FOR UPDATE SKIP LOCKED`` on the transaction row, so when
+    the webhook and the verify poll race, the loser does not wait; it sees no
+    row and backs off. Returns ``False`` when the transaction is already
+    captured (in this session or in the database) or another session holds
+    the lock. SQLite has no row locks, but it only allows one writer at a time.
+    """
+    if transaction.status == TransactionStatus.CAPTURED:
+        return False
+    status = db.execute(
+        select(Transaction.status)
+        .where(Transaction.id == transaction.id)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+    return status is not None and status != TransactionStatus.CAPTURED
+
+
+def find_transaction(db: Session, *criteria) -> Optional[Transaction]:
+    """
+    Load one ``Transaction`` with its player and wallet in a single query.
+
+    The webhook and verify paths always touch ``transaction.player.wallet``;
+    joining them up front avoids two lazy SELECTs per transaction.
+    """
+    return db.execute(
+        select(Transaction)
+        .options(joinedload(Transaction.player).joinedload(Player.wallet))
+        .where(*criteria)
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+# Columns ``PlayerWallet.to_dict`` reports; RETURNed by the credit UPDATE so
+# the new balance comes back without a second SELECT.
+WALLET_BALANCE_COLUMNS = (
+    PlayerWallet.gold_coins,
+    PlayerWallet.health_packs,
+    PlayerWallet.gems,
+    PlayerWallet.inventory_keys,
+    PlayerWallet.session_coins_earned,
+    PlayerWallet.total_earned_coins,
+    PlayerWallet.total_earned_health_packs,
+    PlayerWallet.total_earned_gems,
+    PlayerWallet.total_spent_usd,
+    PlayerWallet.total_treasure_chests,
+)
+
+
+def wallet_balance_from_row(row, player_uuid: str) -> dict:
+    """Shape a ``WALLET_BALANCE_COLUMNS`` row like ``PlayerWallet.to_dict``."""
+    return {
+        "gold_coins": row.gold_coins,
+        "health_packs": row.health_packs,
+        "gems": row.gems,
+        "keys": row.inventory_keys,
+        "session_coins_earned": row.session_coins_earned,
+        "total_earned_coins": row.total_earned_coins,
+        "total_earned_health_packs": row.total_earned_health_packs,
+        "total_earned_gems": row.total_earned_gems,
+        "total_spent_usd": row.total_spent_usd,
+        "total_treasure_chests": row.total_treasure_chests,
+        "player_uuid": player_uuid,
+        "wallet_id": player_uuid,
+    }
+
+
+def find_transactions(db: Session, *criteria) -> list[Transaction]:
+    """Like ``find_transaction`` but returns every match (for batch lookups)."""
+    return list(db.execute(
+        select(Transaction)
+        .options(joinedload(Transaction.player).joinedload(Player.wallet))
+        .where(*criteria)
+    ).scalars())
+
+
 @dataclass
 class CreditResult:
     """Result from crediting a player's account."""
@@ -40,26 +174,75 @@ class StripePaymentHandler:
         self.stripe = stripe_service
     
     def get_or_create_player(self, db: Session, player_uuid: str) -> Player:
-        """Get existing player or create a new one with wallet."""
-        player = db.query(Player).filter(Player.player_uuid == player_uuid).first()
-        
-        if not player:
-            player = Player(player_uuid=player_uuid)
-            player.wallet = PlayerWallet()
-            db.add(player)
-            db.commit()
-            db.refresh(player)
-        
+        """Get existing player or create a new one with wallet (commits)."""
+        player = self.ensure_player(db, player_uuid)
+        db.commit()
         return player
+
+    def ensure_player(self, db: Session, player_uuid: str) -> Player:
+        """
+        Get or create the player + wallet inside the caller's transaction.
+
+        Returning players cost a single SELECT (wallet joined in). New players
+        are created with ``INSERT ... ON CONFLICT`` so two concurrent first
+        purchases for the same UUID cannot race into a unique-key error.
+        Nothing is committed here; the caller owns the transaction.
+        """
+        player = (
+            db.query(Player)
+            .options(joinedload(Player.wallet))
+            .filter(Player.player_uuid == player_uuid)
+            .one_or_none()
+        )
+        if player is not None and player.wallet is not None:
+            return player
+
+        insert = dialect_insert(db)
+        if insert is None:
+            if player is None:
+                player = Player(player_uuid=player_uuid)
+                db.add(player)
+            player.wallet = PlayerWallet()
+            db.flush()
+            return player
+
+        player_stmt = insert(Player).values(player_uuid=player_uuid)
+        player_id = db.execute(
+            player_stmt.on_conflict_do_update(
+                index_elements=[Player.player_uuid],
+                set_={"player_uuid": player_stmt.excluded.player_uuid},
+            ).returning(Player.id)
+        ).scalar_one()
+        db.execute(
+            insert(PlayerWallet)
+            .values(player_id=player_id)
+            .on_conflict_do_nothing(index_elements=[PlayerWallet.player_id])
+        )
+
+        return db.get(
+            Player,
+            player_id,
+            options=[joinedload(Player.wallet)],
+            populate_existing=True,
+        )
     
     def get_player_wallet(self, db: Session, player_uuid: str) -> Optional[dict]:
-        """Get player's wallet balance."""
-        player = db.query(Player).filter(Player.player_uuid == player_uuid).first()
+        """
+        Get player's wallet balance.
+
+        One projected SELECT over the wallet columns (no ORM instances are
+        hydrated); the result has the same shape as ``PlayerWallet.to_dict``.
+        """
+        row = db.execute(
+            select(*WALLET_BALANCE_COLUMNS)
+            .join(Player, PlayerWallet.player_id == Player.id)
+            .where(Player.player_uuid == player_uuid)
+        ).first()
         
-        if not player or not player.wallet:
+        if row is None:
             return None
         
-        return player.wallet.to_dict()
+        return wallet_balance_from_row(row, player_uuid)
     
     def initiate_purchase_payment_intent(
         self,
@@ -83,18 +266,14 @@ class StripePaymentHandler:
             StripePaymentResult with PaymentIntent details
         """
         # Validate package
-        if package_type not in PACKAGES:
+        package = PREPARED_PACKAGES.get(package_type)
+        if package is None:
             return StripePaymentResult(
                 success=False,
                 error=f"Invalid package: {package_type}"
             )
         
-        package = PACKAGES[package_type]
-        
-        # Ensure player exists
-        player = self.get_or_create_player(db, player_uuid)
-        
-        # Create Stripe PaymentIntent
+        # Create Stripe PaymentIntent first so the DB transaction below stays short
         result = self.stripe.create_payment_intent(
             player_uuid=player_uuid,
             package_type=package_type,
@@ -104,21 +283,26 @@ class StripePaymentHandler:
         if not result.success:
             return result
         
-        # Create transaction record
+        # Ensure player exists and record the transaction in one commit
+        player = self.ensure_player(db, player_uuid)
         transaction = Transaction(
             player_id=player.id,
             merchant_reference=result.merchant_reference,
             psp_reference=result.payment_intent_id,  # Store PaymentIntent ID
             package_type=package_type.value,
-            amount_cents=int(package["price"] * 100),
+            amount_cents=package.amount_cents,
             currency="USD",
             status=TransactionStatus.PENDING,
-            gold_coins_reward=package["gold_coins"],
-            health_packs_reward=package["health_packs"],
+            gold_coins_reward=package.gold_coins,
+            health_packs_reward=package.health_packs,
         )
         
         db.add(transaction)
-        db.commit()
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
         
         return result
     
@@ -146,18 +330,14 @@ class StripePaymentHandler:
             StripePaymentResult with checkout details
         """
         # Validate package
-        if package_type not in PACKAGES:
+        package = PREPARED_PACKAGES.get(package_type)
+        if package is None:
             return StripePaymentResult(
                 success=False,
                 error=f"Invalid package: {package_type}"
             )
         
-        package = PACKAGES[package_type]
-        
-        # Ensure player exists
-        player = self.get_or_create_player(db, player_uuid)
-        
-        # Create Stripe Checkout Session
+        # Create Stripe Checkout Session first so the DB transaction below stays short
         result = self.stripe.create_checkout_session(
             player_uuid=player_uuid,
             package_type=package_type,
@@ -169,21 +349,26 @@ class StripePaymentHandler:
         if not result.success:
             return result
         
-        # Create transaction record
+        # Ensure player exists and record the transaction in one commit
+        player = self.ensure_player(db, player_uuid)
         transaction = Transaction(
             player_id=player.id,
             merchant_reference=result.merchant_reference,
             psp_reference=result.payment_intent_id,
             package_type=package_type.value,
-            amount_cents=int(package["price"] * 100),
+            amount_cents=package.amount_cents,
             currency="USD",
             status=TransactionStatus.PENDING,
-            gold_coins_reward=package["gold_coins"],
-            health_packs_reward=package["health_packs"],
+            gold_coins_reward=package.gold_coins,
+            health_packs_reward=package.health_packs,
         )
         
         db.add(transaction)
-        db.commit()
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
         
         return result
     
@@ -211,39 +396,132 @@ class StripePaymentHandler:
             return False, webhook_result.error or "Invalid webhook"
         
         merchant_reference = webhook_result.merchant_reference
+        transaction = None
         
         if not merchant_reference:
             # Try to get from payment intent if not in metadata
             if webhook_result.payment_intent_id:
-                transaction = db.query(Transaction).filter(
-                    Transaction.psp_reference == webhook_result.payment_intent_id
-                ).first()
+                transaction = find_transaction(
+                    db, Transaction.psp_reference == webhook_result.payment_intent_id
+                )
                 if transaction:
                     merchant_reference = transaction.merchant_reference
         
         if not merchant_reference:
             return True, f"No merchant reference for event: {webhook_result.event_type}"
         
-        # Find the transaction
-        transaction = db.query(Transaction).filter(
-            Transaction.merchant_reference == merchant_reference
-        ).first()
+        # Find the transaction (already loaded if it was matched by PaymentIntent)
+        if transaction is None:
+            transaction = find_transaction(
+                db, Transaction.merchant_reference == merchant_reference
+            )
         
         if not transaction:
             return True, f"Transaction not found: {merchant_reference}"
         
-        # Update transaction with webhook data
+        # Stripe retries deliveries; a replayed event id stops here
+        if not record_event_once(db, webhook_result.event_id):
+            return True, f"Duplicate event: {webhook_result.event_id}"
+        
+        message = self.apply_webhook_result(db, webhook_result, transaction)
+        db.commit()
+
+        return True, message
+
+    def process_webhook_batch(
+        self,
+        db: Session,
+        events: list[tuple[bytes, str]],
+    ) -> list[tuple[bool, str]]:
+        """
+        Process a burst of Stripe webhooks (e.g. replays after downtime) at once.
+
+        Every ``(payload, signature)`` pair is verified individually, then the
+        referenced transactions are loaded with two ``IN (...)`` queries and
+        all status changes and wallet credits land in a single commit.
+
+        Returns one ``(success, message)`` tuple per event, in input order.
+        """
+        parsed = [self.stripe.process_webhook(payload, signature) for payload, signature in events]
+
+        merchant_references = {
+            r.merchant_reference for r in parsed if r.valid and r.merchant_reference
+        }
+        payment_intent_ids = {
+            r.payment_intent_id
+            for r in parsed
+            if r.valid and not r.merchant_reference and r.payment_intent_id
+        }
+
+        by_reference: dict[str, Transaction] = {}
+        if merchant_references:
+            for txn in find_transactions(db, Transaction.merchant_reference.in_(merchant_references)):
+                by_reference[txn.merchant_reference] = txn
+        by_payment_intent: dict[str, Transaction] = {}
+        if payment_intent_ids:
+            for txn in find_transactions(db, Transaction.psp_reference.in_(payment_intent_ids)):
+                by_payment_intent[txn.psp_reference] = txn
+
+        results: list[tuple[bool, str]] = []
+        for webhook_result in parsed:
+            if not webhook_result.valid:
+                results.append((False, webhook_result.error or "Invalid webhook"))
+                continue
+
+            merchant_reference = webhook_result.merchant_reference
+            if merchant_reference:
+                transaction = by_reference.get(merchant_reference)
+            else:
+                transaction = by_payment_intent.get(webhook_result.payment_intent_id)
+                if transaction is None:
+                    results.append((True, f"No merchant reference for event: {webhook_result.event_type}"))
+                    continue
+                merchant_reference = transaction.merchant_reference
+
+            if transaction is None:
+                results.append((True, f"Transaction not found: {merchant_reference}"))
+                continue
+
+            if not record_event_once(db, webhook_result.event_id):
+                results.append((True, f"Duplicate event: {webhook_result.event_id}"))
+                continue
+
+            results.append((True, self.apply_webhook_result(db, webhook_result, transaction)))
+
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return results
+
+    def apply_webhook_result(
+        self,
+        db: Session,
+        webhook_result: StripeWebhookResult,
+        transaction: Transaction,
+    ) -> str:
+        """
+        Apply one verified webhook to its transaction (and wallet) without committing.
+
+        Returns the human-readable outcome message.
+        """
+        merchant_reference = transaction.merchant_reference
+
+        # Idempotency: skip if already captured (or being captured by the
+        # verify poll right now); the row lock is held until our commit
+        if not lock_transaction_for_credit(db, transaction):
+            return f"Already processed: {merchant_reference}"
+
+        # Update transaction with webhook data (updated_at is bumped by the
+        # column's onupdate when this flushes)
         transaction.psp_reference = webhook_result.payment_intent_id or transaction.psp_reference
         transaction.payment_method = webhook_result.payment_method_type
-        transaction.webhook_data = json.dumps(webhook_result.raw_data)
-        transaction.updated_at = datetime.now(timezone.utc)
-        
-        # Idempotency: skip if already captured from a previous webhook
-        if transaction.status == TransactionStatus.CAPTURED:
-            return True, f"Already processed: {merchant_reference}"
+        transaction.webhook_data = webhook_result.raw_data
 
-        # Map event to status
-        new_status = self.stripe.get_transaction_status_from_event(
+        # Map event to status and whether it credits, in one lookup
+        new_status, creditable = resolve_webhook_event(
             webhook_result.event_type,
             webhook_result.success or False
         )
@@ -254,17 +532,15 @@ class StripePaymentHandler:
             transaction.error_message = f"Payment failed: {webhook_result.event_type}"
 
         # Credit the player on successful payment
-        if self.stripe.should_credit_player(webhook_result.event_type, webhook_result.success or False):
-            credit_result = self.credit_player_for_transaction(db, transaction)
+        if creditable:
+            credit_result = self.apply_credit(db, transaction)
 
             if credit_result.success:
-                transaction.completed_at = datetime.now(timezone.utc)
+                transaction.completed_at = func.now()
             else:
                 transaction.error_message = credit_result.error
 
-        db.commit()
-
-        return True, f"Processed {webhook_result.event_type} for {merchant_reference}"
+        return f"Processed {webhook_result.event_type} for {merchant_reference}"
     
     def credit_player_for_transaction(
         self,
@@ -274,6 +550,17 @@ class StripePaymentHandler:
         """
         Credit a player's wallet for a completed transaction.
         """
+        credit_result = self.apply_credit(db, transaction)
+        if credit_result.success:
+            db.commit()
+        return credit_result
+
+    def apply_credit(
+        self,
+        db: Session,
+        transaction: Transaction,
+    ) -> CreditResult:
+        """Add a transaction's rewards to the player's wallet without committing."""
         player = transaction.player
         
         if not player:
@@ -282,27 +569,48 @@ class StripePaymentHandler:
                 error="Player not found for transaction"
             )
         
-        wallet = player.wallet
-        
-        if not wallet:
-            wallet = PlayerWallet(player_id=player.id)
-            db.add(wallet)
-        
-        # Add rewards
+        if player.wallet is None:
+            insert = dialect_insert(db)
+            if insert is None:
+                db.add(PlayerWallet(player_id=player.id))
+                db.flush()
+            else:
+                db.execute(
+                    insert(PlayerWallet)
+                    .values(player_id=player.id)
+                    .on_conflict_do_nothing(index_elements=[PlayerWallet.player_id])
+                )
+        
+        # Add rewards in one atomic UPDATE so concurrent webhooks for the same
+        # player cannot lose each other's credits.
         gold_to_add = transaction.gold_coins_reward
         health_to_add = transaction.health_packs_reward
         
-        wallet.add_gold_coins(gold_to_add)
-        wallet.add_health_packs(health_to_add)
-        wallet.total_spent_usd += transaction.amount_cents / 100.0
-        
-        db.commit()
+        statement = (
+            update(PlayerWallet)
+            .where(PlayerWallet.player_id == player.id)
+            .values(
+                gold_coins=PlayerWallet.gold_coins + gold_to_add,
+                total_earned_coins=PlayerWallet.total_earned_coins + gold_to_add,
+                health_packs=PlayerWallet.health_packs + health_to_add,
+                total_earned_health_packs=PlayerWallet.total_earned_health_packs + health_to_add,
+                total_spent_usd=PlayerWallet.total_spent_usd + transaction.amount_cents / 100.0,
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+        if db.get_bind().dialect.update_returning:
+            row = db.execute(statement.returning(*WALLET_BALANCE_COLUMNS)).one()
+        else:
+            db.execute(statement)
+            row = db.execute(
+                select(*WALLET_BALANCE_COLUMNS).where(PlayerWallet.player_id == player.id)
+            ).one()
         
         return CreditResult(
             success=True,
             gold_coins_added=gold_to_add,
             health_packs_added=health_to_add,
-            new_balance=wallet.to_dict(),
+            new_balance=wallet_balance_from_row(row, player.player_uuid),
         )
     
     def verify_payment_result(
@@ -324,13 +632,13 @@ class StripePaymentHandler:
         """
         # Find transaction
         if merchant_reference:
-            transaction = db.query(Transaction).filter(
-                Transaction.merchant_reference == merchant_reference
-            ).first()
+            transaction = find_transaction(
+                db, Transaction.merchant_reference == merchant_reference
+            )
         elif payment_intent_id:
-            transaction = db.query(Transaction).filter(
-                Transaction.psp_reference == payment_intent_id
-            ).first()
+            transaction = find_transaction(
+                db, Transaction.psp_reference == payment_intent_id
+            )
         else:
             return CreditResult(success=False, error="No reference provided")
         
@@ -354,10 +662,15 @@ class StripePaymentHandler:
             intent_data = self.stripe.retrieve_payment_intent(transaction.psp_reference)
             
             if intent_data and intent_data["status"] == "succeeded":
-                # Credit the player
-                credit_result = self.credit_player_for_transaction(db, transaction)
-                transaction.status = TransactionStatus.CAPTURED
-                transaction.completed_at = datetime.utcnow()
+                if not lock_transaction_for_credit(db, transaction):
+                    # The webhook got there first (or is crediting right now)
+                    return CreditResult(success=True)
+
+                # Credit the player and capture in one commit
+                credit_result = self.apply_credit(db, transaction)
+                if credit_result.success:
+                    transaction.status = TransactionStatus.CAPTURED
+                    transaction.completed_at = func.now()
                 db.commit()
                 return credit_result
         
@@ -367,16 +680,6 @@ class StripePaymentHandler:
             error="Payment is being processed. Credits will be added shortly."
         )
     
-    def get_available_packages(self) -> list[dict]:
-        """Get list of available packages for purchase."""
-        return [
-            {
-                "id": package_type.value,
-                "name": package["name"],
-                "price_usd": package["price"],
-                "gold_coins": package["gold_coins"],
-                "health_packs": package["health_packs"],
-            }
-            for package_type, package in PACKAGES.items()
-        ]
-
+    def get_available_packages(self) -> tuple[dict, ...]:
+        """Get the (cached, read-only) list of available packages for purchase."""
+        return AVAILABLE_PACKAGES
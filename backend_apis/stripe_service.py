@@ -4,14 +4,110 @@ Stripe Payment Service for handling Apple Pay and other payment methods.
 Documentation: https://docs.stripe.com/apple-pay?platform=web
 """
 import os
+import threading
+import time
 import uuid
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone
 from typing import Optional
 from dataclasses import dataclass
 
 import stripe
 
-from .models import PackageType, PACKAGES, TransactionStatus
+from .models import PackageType, PREPARED_PACKAGES, TransactionStatus
+
+
+# Seconds before an individual Stripe API call is abandoned.
+STRIPE_HTTP_TIMEOUT = float(os.getenv("STRIPE_HTTP_TIMEOUT", "10"))
+# Keep-alive connections the requests fallback may hold open to Stripe.
+STRIPE_HTTP_POOL_MAXSIZE = int(os.getenv("STRIPE_HTTP_POOL_MAXSIZE", "50"))
+
+
+def build_stripe_http_client() -> Optional[stripe.HTTPClient]:
+    """
+    Build one pooled HTTP client for every Stripe API call in the process.
+
+    ``httpx`` keeps TLS connections to api.stripe.com alive across requests
+    and shares them between threadpool workers, so only the first
+    create-intent / create-checkout pays the handshake. Without httpx, fall
+    back to a single ``requests.Session`` with a larger connection pool
+    (the SDK's own RequestsClient keeps one small session per thread).
+    Returns ``None`` when neither library is installed, leaving Stripe on
+    its default client.
+    """
+    client_cls = getattr(stripe, "HTTPXClient", None)
+    if client_cls is not None:
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            return client_cls(timeout=STRIPE_HTTP_TIMEOUT, allow_sync_methods=True)
+
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+    except ImportError:
+        return None
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=20, pool_maxsize=STRIPE_HTTP_POOL_MAXSIZE),
+    )
+    return stripe.RequestsClient(timeout=STRIPE_HTTP_TIMEOUT, session=session)
+
+
+def install_stripe_http_client() -> None:
+    """Install the shared client as ``stripe.default_http_client`` (once)."""
+    if stripe.default_http_client is None:
+        stripe.default_http_client = build_stripe_http_client()
+
+
+def close_stripe_http_client() -> None:
+    """Release pooled Stripe connections; call on application shutdown."""
+    client = stripe.default_http_client
+    if client is not None:
+        client.close()
+        stripe.default_http_client = None
+
+
+class CustomerIdCache:
+    """
+    Small thread-safe TTL + LRU map of ``email -> Stripe customer id``.
+
+    Repeat purchases by the same email skip the ``Customer.list`` round-trip.
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted once ``maxsize`` is reached.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, email: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return None
+            customer_id, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[email]
+                return None
+            self._entries.move_to_end(email)
+            return customer_id
+
+    def set(self, email: str, customer_id: str) -> None:
+        with self._lock:
+            self._entries[email] = (customer_id, time.monotonic() + self.ttl)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, email: str) -> None:
+        with self._lock:
+            self._entries.pop(email, None)
 
 
 @dataclass
@@ -30,6 +126,7 @@ class StripePaymentResult:
 class StripeWebhookResult:
     """Result from processing a Stripe webhook."""
     valid: bool
+    event_id: Optional[str] = None
     event_type: Optional[str] = None
     payment_intent_id: Optional[str] = None
     merchant_reference: Optional[str] = None
@@ -39,6 +136,29 @@ class StripeWebhookResult:
     error: Optional[str] = None
 
 
+# (event_type, success) -> (transaction status, credit the player?). Anything
+# not listed resolves to FAILED on failure and PENDING otherwise, never credited.
+WEBHOOK_EVENT_OUTCOMES: dict[tuple[str, bool], tuple[TransactionStatus, bool]] = {
+    ("payment_intent.succeeded", True): (TransactionStatus.CAPTURED, True),
+    ("checkout.session.completed", True): (TransactionStatus.CAPTURED, True),
+    ("payment_intent.processing", True): (TransactionStatus.AUTHORIZED, False),
+    ("payment_intent.created", True): (TransactionStatus.PENDING, False),
+}
+UNLISTED_EVENT_OUTCOMES = {
+    True: (TransactionStatus.PENDING, False),
+    False: (TransactionStatus.FAILED, False),
+}
+
+
+def resolve_webhook_event(event_type: str, success: bool) -> tuple[TransactionStatus, bool]:
+    """Return ``(status, creditable)`` for a webhook with one table lookup."""
+    success = bool(success)
+    outcome = WEBHOOK_EVENT_OUTCOMES.get((event_type, success))
+    if outcome is None:
+        return UNLISTED_EVENT_OUTCOMES[success]
+    return outcome
+
+
 class StripePaymentService:
     """
     Handles Stripe payment operations including:
@@ -80,13 +200,47 @@ class StripePaymentService:
         
         # Initialize Stripe with the API key
         stripe.api_key = self.api_key
+        install_stripe_http_client()
+
+        self.customer_cache = CustomerIdCache()
     
     def generate_merchant_reference(self, player_uuid: str, package_type: PackageType) -> str:
-        """Generate a unique merchant reference for the transaction."""
-        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
-        return f"{player_uuid[:8]}_{package_type.value}_{timestamp}_{unique_id}"
+        """
+        Generate a unique merchant reference for the transaction.
+
+        Format: ``<uuid8>_<package>_<YYYYmmddHHMMSS UTC>_<hex8>``. The
+        timestamp is built with integer formatting rather than ``strftime``.
+        """
+        now = datetime.now(timezone.utc)
+        return (
+            f"{player_uuid[:8]}_{package_type.value}_"
+            f"{now.year:04d}{now.month:02d}{now.day:02d}{now.hour:02d}{now.minute:02d}{now.second:02d}_"
+            f"{uuid.uuid4().hex[:8]}"
+        )
     
+    def get_or_create_customer_id(self, email: str, player_uuid: str) -> str:
+        """
+        Return the Stripe customer id for ``email``, creating the customer if needed.
+
+        Served from ``customer_cache`` when possible; only a miss pays for the
+        ``Customer.list`` (and possibly ``Customer.create``) round-trip.
+        """
+        customer_id = self.customer_cache.get(email)
+        if customer_id is not None:
+            return customer_id
+
+        customers = stripe.Customer.list(email=email, limit=1)
+        if customers.data:
+            customer_id = customers.data[0].id
+        else:
+            customer_id = stripe.Customer.create(
+                email=email,
+                metadata={"player_uuid": player_uuid}
+            ).id
+
+        self.customer_cache.set(email, customer_id)
+        return customer_id
+
     def create_payment_intent(
         self,
         player_uuid: str,
@@ -109,14 +263,13 @@ class StripePaymentService:
         Returns:
             StripePaymentResult with PaymentIntent details or error
         """
-        if package_type not in PACKAGES:
+        package = PREPARED_PACKAGES.get(package_type)
+        if package is None:
             return StripePaymentResult(
                 success=False,
                 error=f"Invalid package type: {package_type}"
             )
         
-        package = PACKAGES[package_type]
-        amount_cents = int(package["price"] * 100)
         merchant_reference = self.generate_merchant_reference(player_uuid, package_type)
         
         # Default to card (which includes Apple Pay via Express Checkout Element)
@@ -125,35 +278,25 @@ class StripePaymentService:
         
         try:
             # Create or retrieve customer
-            customer = None
+            customer_id = None
             if customer_email:
-                # Search for existing customer
-                customers = stripe.Customer.list(email=customer_email, limit=1)
-                if customers.data:
-                    customer = customers.data[0]
-                else:
-                    customer = stripe.Customer.create(
-                        email=customer_email,
-                        metadata={"player_uuid": player_uuid}
-                    )
+                customer_id = self.get_or_create_customer_id(customer_email, player_uuid)
             
             # Build payment intent parameters
             intent_params = {
-                "amount": amount_cents,
+                "amount": package.amount_cents,
                 "currency": "usd",
                 "payment_method_types": payment_method_types,
                 "metadata": {
+                    **package.metadata,
                     "player_uuid": player_uuid,
-                    "package_type": package_type.value,
                     "merchant_reference": merchant_reference,
-                    "gold_coins": str(package["gold_coins"]),
-                    "health_packs": str(package["health_packs"]),
                 },
-                "description": package["name"],
+                "description": package.name,
             }
             
-            if customer:
-                intent_params["customer"] = customer.id
+            if customer_id:
+                intent_params["customer"] = customer_id
                 intent_params["receipt_email"] = customer_email
             
             payment_intent = stripe.PaymentIntent.create(**intent_params)
@@ -200,14 +343,13 @@ class StripePaymentService:
         Returns:
             StripePaymentResult with checkout session details or error
         """
-        if package_type not in PACKAGES:
+        package = PREPARED_PACKAGES.get(package_type)
+        if package is None:
             return StripePaymentResult(
                 success=False,
                 error=f"Invalid package type: {package_type}"
             )
         
-        package = PACKAGES[package_type]
-        amount_cents = int(package["price"] * 100)
         merchant_reference = self.generate_merchant_reference(player_uuid, package_type)
         
         success_url = success_url or f"{self.return_url}?ref={merchant_reference}&session_id={{CHECKOUT_SESSION_ID}}"
@@ -223,20 +365,18 @@ class StripePaymentService:
                         "price_data": {
                             "currency": "usd",
                             "product_data": {
-                                "name": package["name"],
-                                "description": f"Gold Coins: {package['gold_coins']}, Health Packs: {package['health_packs']}",
+                                "name": package.name,
+                                "description": package.description,
                             },
-                            "unit_amount": amount_cents,
+                            "unit_amount": package.amount_cents,
                         },
                         "quantity": 1,
                     }
                 ],
                 "metadata": {
+                    **package.metadata,
                     "player_uuid": player_uuid,
-                    "package_type": package_type.value,
                     "merchant_reference": merchant_reference,
-                    "gold_coins": str(package["gold_coins"]),
-                    "health_packs": str(package["health_packs"]),
                 },
                 # Enable automatic payment methods including Apple Pay
                 "payment_method_types": ["card"],
@@ -326,6 +466,11 @@ class StripePaymentService:
                 elif event_type in ["payment_intent.payment_failed", "payment_intent.canceled"]:
                     success = False
             
+            elif event_type == "customer.deleted":
+                deleted_email = getattr(data_object, "email", None)
+                if deleted_email:
+                    self.customer_cache.discard(deleted_email)
+
             elif event_type.startswith("checkout.session."):
                 merchant_reference = data_object.metadata.get("merchant_reference")
                 payment_intent_id = data_object.payment_intent
@@ -337,6 +482,7 @@ class StripePaymentService:
             
             return StripeWebhookResult(
                 valid=True,
+                event_id=event.get("id"),
                 event_type=event_type,
                 payment_intent_id=payment_intent_id,
                 merchant_reference=merchant_reference,
@@ -367,17 +513,7 @@ class StripePaymentService:
         Returns:
             TransactionStatus enum value
         """
-        if not success:
-            return TransactionStatus.FAILED
-        
-        status_map = {
-            "payment_intent.succeeded": TransactionStatus.CAPTURED,
-            "payment_intent.created": TransactionStatus.PENDING,
-            "payment_intent.processing": TransactionStatus.AUTHORIZED,
-            "checkout.session.completed": TransactionStatus.CAPTURED,
-        }
-        
-        return status_map.get(event_type, TransactionStatus.PENDING)
+        return resolve_webhook_event(event_type, success)[0]
     
     def should_credit_player(self, event_type: str, success: bool) -> bool:
         """
@@ -390,12 +526,7 @@ class StripePaymentService:
         Returns:
             True if player should be credited
         """
-        # Credit on successful payment
-        creditable_events = [
-            "payment_intent.succeeded",
-            "checkout.session.completed",
-        ]
-        return event_type in creditable_events and success
+        return resolve_webhook_event(event_type, success)[1]
     
     def retrieve_payment_intent(self, payment_intent_id: str) -> Optional[dict]:
         """
@@ -10,11 +10,9 @@ sys.path.insert(0, game_dir)
 
 # this file will house the fundamental game play logic of new space cowboys python web app game
 import time
-import random
 import json
 import uuid
 from pygame.locals import * #For useful variables
-from typing import Any
 from config import (
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
@@ -23,15 +21,16 @@ from config import (
     BACKEND_API_URL,
 )
 from web_http import request_json, kick_off_background_json
-from treasureChest import TreasureChest
 from obstacle import Block, shape
 from spaceship import SpaceShip
-from laser import Laser
-from alien import Alien, AlienDiagonal, AlienDiver, MysteryShip
+from alien import RNG, Alien, AlienDiagonal, AlienDiver, AlienFleet, MysteryShip
+from spatial_hash import SpatialHash
 from treasureChest import TreasureChest, Key
 from button import Button
+from image_cache import cached_surface, load_background, load_image
 from player import Player
-from mainMenu import theme_manager
+from sound_cache import load_sound
+from mainMenu import get_font, open_display, theme_manager
 from mainMenu import main_menu  # Entry point for web: menu -> play -> game
 
 
@@ -274,9 +273,7 @@ def get_active_screen():
     """
     surf = pygame.display.get_surface()
     if surf is None:
-        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Space Cowboys")
-        return pygame.display.get_surface()
+        return open_display("Space Cowboys")
     return surf
 
 
@@ -293,15 +290,6 @@ BLACK = (0, 0, 0) #screen overlay to create multiple screens illusion
 # Asset paths: all game assets (images, fonts, audio) live inside the game/ directory.
 script_dir = game_dir
 
-# Window background space image
-try:
-    nebula_image = pygame.image.load(DEFAULT_BACKGROUND_THEME).convert()
-    nebula_bg = pygame.transform.scale(nebula_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-except Exception as exc:
-    print(f"Warning: Could not load background image '{DEFAULT_BACKGROUND_THEME}': {exc}")
-    nebula_bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-    nebula_bg.fill((10, 10, 20))
-
 # Font link
 try:
     title_font = pygame.font.Font(resource_path("assets", "Fonts", "hyperspace", "Hyperspace Bold Italic.otf"), 36)
@@ -316,41 +304,11 @@ try:
 except Exception:
     font = pygame.font.SysFont("arial", 20)
 
-# HeroShip class definition
-class HeroShip(pygame.sprite.Sprite):
-    def __init__(self, x, y, width, height, lives,level, health=100, ):
-        super().__init__()
-        self.image = pygame.image.load(resource_path("assets", "spaceship.png"))
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
-        self.width = width
-        self.height = height
-        self.health = health
-        self.lives = 3
-        self.laser = []
-        self.laser_cool_down = 0.5
-        self.level = 0
-        self.points = 0
-        self.speed = 5
-        
-
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
-
-
 # creating new group for all space ships (hero & enemies)
 spaceship = SpaceShip(100, SCREEN_HEIGHT - 100, 100)
 spaceship_group = pygame.sprite.GroupSingle()
 spaceship_group.add(spaceship) 
 
-# creating new group for all lasers
-laser_group = pygame.sprite.Group()
-
-# Create hero ship once (not in the game loop!)
-hero_ship = HeroShip(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100, 100, 100, 3, 100)
-hero_group = pygame.sprite.GroupSingle()
-hero_group.add(hero_ship)
-
 # health group variables/function
 
 def decrement_health(player, screen):
@@ -388,6 +346,16 @@ def decrement_health(player, screen):
     screen.blit(health_text, text_rect)
 
 # creating levels class OOP elements for game loop functionality
+def dim_overlay(alpha):
+    """Full-screen black overlay blended at ``alpha``, built once per alpha value."""
+    def build():
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        overlay.set_alpha(alpha)
+        overlay.fill(BLACK)
+        return overlay
+    return cached_surface(f"overlay#{alpha}", build)
+
+
 class Level (pygame.sprite.Sprite):
     # Class variable to track current level index across instances
     current_level_index = 0
@@ -412,6 +380,8 @@ class Level (pygame.sprite.Sprite):
         4: {"rows": 5, "cols": 10, "speed": 3, "diagonal_count": 10, "diver_count": 7}, # Level 5 (idx 4)
         5: {"rows": 6, "cols": 10, "speed": 4, "diagonal_count": 12, "diver_count": 10} # Level 6 (idx 5)
     }
+    # Highest level index; level_dict never changes at runtime
+    max_level = max(level_dict)
     
     def __init__(self, level_number = None):
         super().__init__()
@@ -421,13 +391,8 @@ class Level (pygame.sprite.Sprite):
     
     def show_level_up_message(self, screen, font):
         """Display animated level-up celebration"""
-        # Create celebration overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        
-        # Use config screen dimensions (compatible with web/Pygbag)
-        print(f"Screen size: {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+        # Create celebration overlay (built once, shared by every call)
+        overlay = dim_overlay(128)
     
 
     def get_current_level(self, new_game = False):
@@ -441,8 +406,7 @@ class Level (pygame.sprite.Sprite):
     @staticmethod
     def increment_level():
         """Move to next level if available"""
-        max_level = max(Level.level_dict.keys())
-        if Level.current_level_index < max_level:
+        if Level.current_level_index < Level.max_level:
             Level.current_level_index += 1
         return Level.current_level_index
     
@@ -498,20 +462,14 @@ class Level (pygame.sprite.Sprite):
 
     # alien 'collisions' w/ laser logic
 
-# alien collisions
-alien = Alien(1, 2, 100, 100)  # Create an alien instance
-
-# Initialize score and create aliens group
+# Initialize score
 score = 0
-aliens_group = pygame.sprite.Group()
 
-# Create some aliens to display
-for row in range(3):
-    for col in range(8):
-        x = 100 + col * 80
-        y = 50 + row * 60
-        alien = Alien(1, 2, x, y)
-        aliens_group.add(alien)
+# pygame-ce (what pygbag ships) has Surface.fblits; upstream pygame has blits only
+HAS_FBLITS = hasattr(pygame.Surface, "fblits")
+
+# Chest rewards mark the wallet dirty; the backend sync runs at most this often
+WALLET_SYNC_INTERVAL_MS = 5000
 
 
 # Game loop setup
@@ -526,31 +484,43 @@ class Game:
         
         # Economy system setup
         self.economy = GameEconomy(initial_health=100)
+        self.wallet_sync_pending = False
+        self.last_wallet_sync = pygame.time.get_ticks()
 
         # health and score setup
         self.lives = 3
-        try:
-            self.live_surf = pygame.image.load(DEFAULT_BACKGROUND_THEME).convert_alpha()
-            self.live_x_start_pos = SCREEN_WIDTH - (self.live_surf.get_size()[0] * 2 + 20)
-        except:
-            self.live_surf = None
-            self.live_x_start_pos = SCREEN_WIDTH - 100
         self.score = 0
         self.font = pygame.font.Font(resource_path("assets", "Fonts", "hyperspace", "Hyperspace Bold Italic.otf"), 20)
+        # (text, color, font) -> rendered Surface for banners shown over many frames
+        self.text_cache = {}
+        # HUD slot -> (text, Surface); re-rendered only when the value changes
+        self.hud_text = {}
         # Obstacle setup
         self.shape = shape
         self.block_size = 6
         self.blocks = pygame.sprite.Group()
+        # Background + blocks composite, see get_static_layer()
+        self.static_layer = None
+        self.static_layer_key = None
         self.obstacle_amount = 4
-        self.obstacle_x_positions = [num * (SCREEN_WIDTH / self.obstacle_amount) for num in range(self.obstacle_amount)]
+        obstacle_step = SCREEN_WIDTH // self.obstacle_amount
+        self.obstacle_x_positions = tuple(num * obstacle_step for num in range(self.obstacle_amount))
         # Create obstacles - will be implemented in create_multiple_obstacles method
         # self.create_multiple_obstacles(*self.obstacle_x_positions, x_start=SCREEN_WIDTH / 15, y_start=480)
 
+        # Decode, rotate and scale every sprite image now rather than on first spawn
+        Alien.preload_images()
+        TreasureChest.get_image()
+        Key.get_image()
+
         # Alien setup
-        self.aliens = pygame.sprite.Group()  # Type 1: horizontal formation
+        self.aliens = AlienFleet()  # Type 1: horizontal formation
         self.diagonal_aliens = pygame.sprite.Group()  # Type 2: diagonal movement
         self.diver_aliens = pygame.sprite.Group()  # Type 3: straight down dive
         self.alien_lasers = pygame.sprite.Group()
+        self.alien_hash = SpatialHash()
+        # Obstacle blocks never move, so their grid is built once per layout
+        self.block_hash = SpatialHash(cell=32)
         self.alien_setup()  # Uses level config for predetermined alien counts
         self.alien_direction = 1
         
@@ -558,7 +528,7 @@ class Game:
         self.mystery_ship = pygame.sprite.GroupSingle()
         self.treasure_chests = pygame.sprite.Group()
         self.keys = pygame.sprite.Group()
-        self.mystery_ship_spawn_time = random.randint(400, 800)  # Frames until mystery ship spawns
+        self.mystery_ship_spawn_time = RNG.randint(400, 800)  # Frames until mystery ship spawns
         # Key inventory: each key unlocks exactly one treasure chest, whether
         # the chest is grabbed in-world or opened later from the wallet panel.
         self.player_keys = 0
@@ -579,22 +549,24 @@ class Game:
 
         # Extra setup
         self.extra = pygame.sprite.GroupSingle()
-        self.extra_spawn_time = random.randint(40,80)
+        self.extra_spawn_time = RNG.randint(40,80)
 
         # Audio setup - handle missing files gracefully
         try:
-            music = pygame.mixer.Sound(resource_path("audio", "music.wav"))
+            music = load_sound("audio", "music.wav")
             music.set_volume(0.2)
-            music.play(loops = -1)
+            # The Sound is shared across games; don't stack a second loop
+            if music.get_num_channels() == 0:
+                music.play(loops = -1)
         except:
             pass
         try:
-            self.laser_sound = pygame.mixer.Sound(resource_path("audio", "audio_laser.ogg"))
+            self.laser_sound = load_sound("audio", "audio_laser.ogg")
             self.laser_sound.set_volume(0.5)
         except:
             self.laser_sound = None
         try:
-            self.explosion_sound = pygame.mixer.Sound(resource_path("audio", "explosion.wav"))
+            self.explosion_sound = load_sound("audio", "explosion.wav")
             self.explosion_sound.set_volume(0.3)
         except:
             self.explosion_sound = None
@@ -717,17 +689,13 @@ class Game:
         self.backgrounds["BLACK"] = black_bg
         
         # Purple nebula background (using config default)
-        nebula_image = pygame.image.load(DEFAULT_BACKGROUND_THEME).convert()
-        nebula_bg = pygame.transform.scale(nebula_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.backgrounds["PURPLE_NEBULA"] = nebula_bg
+        self.backgrounds["PURPLE_NEBULA"] = load_background(DEFAULT_BACKGROUND_THEME)
         
         # Main menu background (purple gradient)
         menu_bg_path = resource_path("assets", "main_menu_background.png")
         if os.path.exists(menu_bg_path):
             try:
-                menu_bg_img = pygame.image.load(menu_bg_path).convert()
-                menu_bg = pygame.transform.scale(menu_bg_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                self.backgrounds["MENU_GRADIENT"] = menu_bg
+                self.backgrounds["MENU_GRADIENT"] = load_background(menu_bg_path)
             except pygame.error:
                 print(f"Warning: Could not load {menu_bg_path}")
                 # Fallback to black if menu background can't be loaded
@@ -747,6 +715,23 @@ class Game:
         """Get the current background surface"""
         return self.backgrounds.get(self.current_theme, self.backgrounds["BLACK"])
 
+    def get_static_layer(self):
+        """
+        Current background with the obstacle blocks already drawn on it.
+
+        Blocks never move, so instead of blitting the background and ~236
+        blocks every frame the composite is rebuilt only when the theme
+        changes or a block is created or shot away (the block count changes).
+        """
+        background = self.get_current_background()
+        key = (id(background), len(self.blocks))
+        if key != self.static_layer_key:
+            layer = background.copy()
+            layer.blits([(block.image, block.rect) for block in self.blocks], doreturn=False)
+            self.static_layer = layer
+            self.static_layer_key = key
+        return self.static_layer
+
     def cycle_background_theme(self):
         """Cycle to the next available background theme"""
         themes = list(self.backgrounds.keys())
@@ -773,22 +758,26 @@ class Game:
         })
         #endregion
 
+        # The loops below touch the player, economy and explosion sound on
+        # every hit; bind them once instead of re-walking the attribute chains.
+        player = self.player.sprite
+        economy = self.economy
+        explosion_sound = self.explosion_sound
+
         # player lasers - use list() copy to safely remove sprites during iteration
         # (Pygbag/Emscripten crashes if sprite group is modified during iteration)
-        if self.player.sprite.lasers:
-            for laser in list(self.player.sprite.lasers):
+        if player.lasers:
+            # Bucket every alien (all three types) once; each laser then only
+            # tests the aliens in its own grid cells.
+            self.alien_hash.rebuild(self.aliens, self.diagonal_aliens, self.diver_aliens)
+            for laser in list(player.lasers):
                 # obstacle collisions
-                if pygame.sprite.spritecollide(laser, self.blocks, True):
+                if self.block_hash.collide(laser, dokill=True):
                     laser.kill()
                     continue  # laser is gone, skip remaining checks
                 
-                # alien collisions - check all alien groups
-                # Type 1: Standard formation aliens
-                aliens_hit = pygame.sprite.spritecollide(laser, self.aliens, True)
-                # Type 2: Diagonal aliens
-                diagonal_hit = pygame.sprite.spritecollide(laser, self.diagonal_aliens, True)
-                # Type 3: Diver aliens
-                diver_hit = pygame.sprite.spritecollide(laser, self.diver_aliens, True)
+                # alien collisions - all alien groups via the spatial hash
+                all_hits = self.alien_hash.collide(laser, dokill=True)
                 
                 # Mystery Ship collision
                 mystery_hit = pygame.sprite.spritecollide(laser, self.mystery_ship, False)
@@ -797,8 +786,8 @@ class Game:
                         is_destroyed = mystery.take_damage(50)  # 3 hits to destroy (50 damage × 3 = 150 health)
                         if is_destroyed:
                             self.score += mystery.value
-                            self.economy.add_score(mystery.value)
-                            self.economy.add_coins(mystery.value * 2)  # Double coins for mystery ship
+                            economy.add_score(mystery.value)
+                            economy.add_coins(mystery.value * 2)  # Double coins for mystery ship
                             self.mystery_bounty_end_time = pygame.time.get_ticks() + self.mystery_bounty_duration_ms
                             # Spawn treasure chest at mystery ship location
                             treasure = TreasureChest.spawn_from_mystery_ship(mystery.rect)
@@ -807,61 +796,62 @@ class Game:
                             key = Key(mystery.rect.centerx + 50, mystery.rect.centery)
                             self.keys.add(key)
                             mystery.kill()
-                            if self.explosion_sound:
-                                self.explosion_sound.play()
+                            if explosion_sound:
+                                explosion_sound.play()
                     laser.kill()
                     continue  # laser is gone, skip remaining checks
                 
-                all_hits = aliens_hit + diagonal_hit + diver_hit
                 if all_hits:
                     for alien in all_hits:
                         self.score += alien.value
                         # Update economy: add score and coins (1 coin per alien value point)
-                        self.economy.add_score(alien.value)
-                        self.economy.add_coins(alien.value)
+                        economy.add_score(alien.value)
+                        economy.add_coins(alien.value)
                     laser.kill()
-                    if self.explosion_sound:
-                        self.explosion_sound.play()
+                    if explosion_sound:
+                        explosion_sound.play()
         
         # Player collision with keys — each pickup adds one consumable key
         for key in list(self.keys):
-            if pygame.sprite.collide_rect(self.player.sprite, key):
+            if pygame.sprite.collide_rect(player, key):
                 key.collect()
                 self.player_keys += 1
         
         # Player collision with treasure chests (key required). Consumes exactly
         # one key per chest unlocked in-world; extra keys remain in inventory.
         for chest in list(self.treasure_chests):
-            if pygame.sprite.collide_rect(self.player.sprite, chest) and chest.locked:
+            if pygame.sprite.collide_rect(player, chest) and chest.locked:
                 if self.player_keys > 0:
                     rewards = chest.unlock()
                     if rewards:
                         randomized_bonus = rewards.get('coins', 0)
                         if randomized_bonus > 0:
                             self.score += randomized_bonus
-                            self.economy.add_coins(randomized_bonus)
-                            self.economy.save_session_coins()
-                            self.economy.sync_wallet()
+                            economy.add_coins(randomized_bonus)
+                            economy.save_session_coins()
+                            self.wallet_sync_pending = True
                         if rewards.get('health_packs', 0) > 0:
                             health_gain = rewards['health_packs'] * 10
-                            self.player.sprite.health = min(100, self.player.sprite.health + health_gain)
+                            player.health = min(100, player.health + health_gain)
                         chest.kill()
                         self.player_keys -= 1
                 else:
                     self.show_need_key_hint()
 
-        # direct alien collision with player (aliens touching player) - check all groups
-        aliens_touching_player = pygame.sprite.spritecollide(self.player.sprite, self.aliens, True)
-        diagonal_touching_player = pygame.sprite.spritecollide(self.player.sprite, self.diagonal_aliens, True)
-        diver_touching_player = pygame.sprite.spritecollide(self.player.sprite, self.diver_aliens, True)
-        aliens_touching_player = aliens_touching_player + diagonal_touching_player + diver_touching_player
+        # direct alien collision with player (aliens touching player) - check all
+        # groups with one C-level rect scan instead of three spritecollide loops
+        all_aliens = [*self.aliens, *self.diagonal_aliens, *self.diver_aliens]
+        touching = player.rect.collidelistall([alien.rect for alien in all_aliens])
+        aliens_touching_player = [all_aliens[i] for i in touching]
+        for alien in aliens_touching_player:
+            alien.kill()
         if aliens_touching_player:
             # if player/alien collide, decrement health by 25% for each collision
             for alien in aliens_touching_player:
-                decrement_health(self.player.sprite, screen)
+                decrement_health(player, screen)
 
             # Update economy health based on player's actual health
-            self.economy.update_health(int(self.player.sprite.health))
+            economy.update_health(int(player.health))
 
             #region agent log
             agent_log({
@@ -871,20 +861,20 @@ class Game:
                 "message": "alien_player_collision",
                 "data": {
                     "collisions": len(aliens_touching_player),
-                    "player_health": self.player.sprite.health,
-                    "health_percentage": self.player.sprite.health,
+                    "player_health": player.health,
+                    "health_percentage": player.health,
                 },
             })
             #endregion
 
-            if self.player.sprite.health <= 0:
+            if player.health <= 0:
                 #region agent log
                 agent_log({
                     "runId": "pre-fix",
                     "hypothesisId": "A",
                     "location": "game/__main__.py:collision_checks:game_over",
                     "message": "player_out_of_health",
-                    "data": {"health": self.player.sprite.health},
+                    "data": {"health": player.health},
                 })
                 #endregion
                 return False  # Signal game over
@@ -916,6 +906,7 @@ class Game:
     def create_multiple_obstacles(self, *offset, x_start, y_start):
         for offset_x in offset:
             self.create_obstacle(x_start, y_start, offset_x)
+        self.block_hash.rebuild(self.blocks)
 
     def alien_setup(self, rows=None, cols=None, speed=None, x_distance=60, y_distance=48, x_offset=70, y_offset=100):
         """Setup aliens for current level with predetermined counts for each type."""
@@ -961,49 +952,64 @@ class Game:
         for i in range(diver_count):
             # Spread divers randomly but evenly across screen width
             section_width = (SCREEN_WIDTH - 100) // max(1, diver_count)
-            x = 50 + (i * section_width) + random.randint(0, section_width // 2)
+            x = 50 + (i * section_width) + RNG.randint(0, section_width // 2)
             y = -60 - (i * 50)  # Stagger entry more than diagonals
             diver = AlienDiver(speed, x, y, level_multiplier=current_level)
             self.diver_aliens.add(diver)
 
+    def flush_wallet_sync(self, force=False):
+        """
+        Push pending chest rewards to the backend in one sync_wallet() call.
+
+        Unlocking several chests in a burst used to fire one blocking sync per
+        chest; now they only mark the wallet dirty and this runs once every
+        WALLET_SYNC_INTERVAL_MS (or right away with ``force``, e.g. when the
+        wallet panel opens or the level ends).
+        """
+        now = pygame.time.get_ticks()
+        if not force and (not self.wallet_sync_pending or now - self.last_wallet_sync < WALLET_SYNC_INTERVAL_MS):
+            return
+        self.wallet_sync_pending = False
+        self.last_wallet_sync = now
+        try:
+            self.economy.sync_wallet()
+        except Exception as exc:
+            print(f"[GameEconomy] sync_wallet skipped: {exc}")
+
+    def draw_groups(self, screen, *groups):
+        """
+        Blit every sprite of ``groups`` (in the given order) in one call.
+
+        Group.draw() already uses blits() but also collects a rect per sprite
+        for Group.clear(), which this game never calls. Aliens of a type share
+        one surface, so on pygame-ce fblits() can reuse the source pixels.
+        """
+        sequence = [(sprite.image, sprite.rect) for group in groups for sprite in group]
+        if HAS_FBLITS:
+            screen.fblits(sequence)
+        else:
+            screen.blits(sequence, doreturn=False)
+
     def alien_position_checker(self):
         """Check if aliens hit edges and reverse direction"""
-        for alien in self.aliens:
-            if alien.rect.right >= SCREEN_WIDTH or alien.rect.left <= 0:
-                self.alien_direction *= -1
-                for a in self.aliens:
-                    a.rect.y += 20  # Move down
-                break
-
-    def remove_offscreen_aliens(self):
-        """Remove aliens that have moved below the screen (player survived by avoiding them)"""
-        # Check Type 1 aliens (formation)
-        for alien in list(self.aliens):
-            if alien.rect.top > SCREEN_HEIGHT:
-                alien.kill()
-        
-        # Check Type 2 aliens (diagonal)
-        for alien in list(self.diagonal_aliens):
-            if alien.rect.top > SCREEN_HEIGHT:
-                alien.kill()
-        
-        # Check Type 3 aliens (diver)
-        for alien in list(self.diver_aliens):
-            if alien.rect.top > SCREEN_HEIGHT:
-                alien.kill()
+        # AlienFleet.update() already noted whether any alien touched an edge.
+        if self.aliens.edge_hit:
+            self.alien_direction *= -1
+            self.aliens.drop(20)  # Move down
+            self.aliens.edge_hit = False
 
     def extra_alien_timer(self):
         """Handle extra alien spawning"""
         self.extra_spawn_time -= 1
         if self.extra_spawn_time <= 0:
-            self.extra_spawn_time = random.randint(400, 800)
+            self.extra_spawn_time = RNG.randint(400, 800)
     
     def mystery_ship_timer(self):
         """Handle mystery ship spawning"""
         self.mystery_ship_spawn_time -= 1
         if self.mystery_ship_spawn_time <= 0 and not self.mystery_ship:
             # Spawn mystery ship from left or right side randomly
-            side = random.choice(['left', 'right'])
+            side = RNG.choice(['left', 'right'])
             if side == 'left':
                 x = -50
             else:
@@ -1011,16 +1017,16 @@ class Game:
             mystery = MysteryShip(x, 50)
             mystery.direction = 1 if side == 'left' else -1
             self.mystery_ship.add(mystery)
-            self.mystery_ship_spawn_time = random.randint(600, 1200)  # Reset timer
+            self.mystery_ship_spawn_time = RNG.randint(600, 1200)  # Reset timer
 
     def load_mystery_bounty_image(self):
         """Load and cache center-screen bounty chest image."""
         if self.mystery_bounty_image is not None:
             return self.mystery_bounty_image
 
-        chest_path = resource_path("assets", "treasure_chest.png")
         try:
-            image = pygame.image.load(chest_path).convert_alpha()
+            # Same decoded surface the treasure chest sprites scale from
+            image = load_image("assets", "treasure_chest.png")
             self.mystery_bounty_image = pygame.transform.scale(image, (180, 180))
         except (pygame.error, FileNotFoundError):
             fallback = pygame.Surface((180, 180), pygame.SRCALPHA)
@@ -1035,9 +1041,7 @@ class Game:
         if now >= self.mystery_bounty_end_time:
             return
 
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 90))
-        screen.blit(overlay, (0, 0))
+        screen.blit(dim_overlay(90), (0, 0))
 
         chest_image = self.load_mystery_bounty_image().copy()
         pulse = 210 + int(45 * pygame.math.Vector2(0, 1).rotate(now * 0.25).y)
@@ -1045,28 +1049,59 @@ class Game:
         chest_rect = chest_image.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
         screen.blit(chest_image, chest_rect)
 
-        title = self.font.render("MYSTERY BOUNTY!", True, (255, 230, 90))
+        title = self.render_text("MYSTERY BOUNTY!", (255, 230, 90))
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 90))
         screen.blit(title, title_rect)
 
-        subtitle = self.font.render("Treasure claimed after destroying the mystery ship!", True, (255, 255, 255))
+        subtitle = self.render_text("Treasure claimed after destroying the mystery ship!", (255, 255, 255))
         subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120))
         screen.blit(subtitle, subtitle_rect)
 
+    def render_text(self, text, color, font=None):
+        """
+        Render ``text`` (with the game font unless ``font`` is given) once and
+        reuse the Surface after.
+
+        Only for messages that repeat verbatim frame after frame (level and
+        victory banners, hints); anti-aliased rasterization is the expensive
+        part of drawing them.
+        """
+        font = font or self.font
+        key = (text, color, font)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.text_cache[key] = surface
+        return surface
+
+    def render_hud_text(self, slot, text, color, font=None):
+        """
+        Return the Surface for a HUD line, re-rendering only when ``text`` changes.
+
+        Each slot (score, coins, level...) keeps just its latest rendering, so
+        steady-state frames blit without rasterizing and the cache never grows.
+        """
+        cached = self.hud_text.get(slot)
+        if cached is not None and cached[0] == text:
+            return cached[1]
+        surface = (font or self.font).render(text, True, color)
+        self.hud_text[slot] = (text, surface)
+        return surface
+
     def display_score(self):
         """Display current score"""
-        score_text = self.font.render(f"Score: {self.score}", True, (255, 255, 255))
+        score_text = self.render_hud_text("score", f"Score: {self.score}", (255, 255, 255))
         screen.blit(score_text, (10, 10))
     
     def display_coins(self):
         """Display total gold coins (wallet balance + current session earnings)"""
         total_coins = self.economy.get_total_coins() + self.economy.session_coins_earned
-        coins_text = self.font.render(f"Gold: {total_coins}", True, (255, 215, 0))  # Gold color
+        coins_text = self.render_hud_text("coins", f"Gold: {total_coins}", (255, 215, 0))  # Gold color
         screen.blit(coins_text, (10, 40))
     
     def display_level(self):
         """Display current level"""
-        level_text = self.font.render(f"Level: {Level.current_level_index + 1}", True, (255, 255, 255))
+        level_text = self.render_hud_text("level", f"Level: {Level.current_level_index + 1}", (255, 255, 255))
         screen.blit(level_text, (10, 70))
 
     def display_health(self):
@@ -1090,14 +1125,14 @@ class Game:
         pygame.draw.rect(screen, (255, 255, 255), background_rect, 2)
         
         # Display health percentage text
-        health_text = self.font.render(f"Health: {self.player.sprite.health}%", True, (255, 255, 255))
+        health_text = self.render_hud_text("health", f"Health: {self.player.sprite.health}%", (255, 255, 255))
         text_rect = health_text.get_rect(center=(SCREEN_WIDTH // 2, bar_y - 15))
         screen.blit(health_text, text_rect)
     
     def display_key_indicator(self):
         """Display the player's key count on the HUD when at least one is held."""
         if self.player_keys > 0:
-            key_text = self.font.render(f"Keys x {self.player_keys}", True, (255, 215, 0))
+            key_text = self.render_hud_text("keys", f"Keys x {self.player_keys}", (255, 215, 0))
             screen.blit(key_text, (10, 100))
 
     def show_need_key_hint(self):
@@ -1107,7 +1142,7 @@ class Game:
     def draw_need_key_hint(self, screen):
         """Render the 'NEED KEY!' hint if the timer is still active."""
         if pygame.time.get_ticks() < self.need_key_hint_end:
-            hint = self.font.render("NEED KEY! Destroy the Mystery Ship first!", True, (255, 80, 80))
+            hint = self.render_text("NEED KEY! Destroy the Mystery Ship first!", (255, 80, 80))
             hint_rect = hint.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 160))
             screen.blit(hint, hint_rect)
 
@@ -1145,7 +1180,7 @@ class Game:
                 self.score += bonus
                 self.economy.add_coins(bonus)
                 self.economy.save_session_coins()
-                self.economy.sync_wallet()
+                self.wallet_sync_pending = True
             if rewards.get('health_packs', 0) > 0:
                 health_gain = rewards['health_packs'] * 10
                 self.player.sprite.health = min(100, self.player.sprite.health + health_gain)
@@ -1270,35 +1305,32 @@ class Game:
     def display_pause_screen(self, screen, mouse_pos=None):
         """Display pause overlay and menu"""
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        screen.blit(overlay, (0, 0))
+        screen.blit(dim_overlay(180), (0, 0))
         
-        # Pause title
-        pause_font = pygame.font.Font(resource_path("assets", "Fonts", "hyperspace", "Hyperspace Bold Italic.otf"), 60)
-        pause_text = pause_font.render("PAUSED", True, (255, 255, 0))
+        # Pause title (fonts, overlay and static lines are built once)
+        pause_font = get_font(60)
+        pause_text = self.render_text("PAUSED", (255, 255, 0), pause_font)
         text_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
         screen.blit(pause_text, text_rect)
         
         # Instructions
-        instruction_font = pygame.font.Font(resource_path("assets", "Fonts", "hyperspace", "Hyperspace Bold Italic.otf"), 24)
+        instruction_font = get_font(24)
         
-        resume_text = instruction_font.render("Press P or ESC to Resume", True, (255, 255, 255))
+        resume_text = self.render_text("Press P or ESC to Resume", (255, 255, 255), instruction_font)
         resume_rect = resume_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(resume_text, resume_rect)
         
-        quit_text = instruction_font.render("Press Q to Quit to Menu", True, (200, 200, 200))
+        quit_text = self.render_text("Press Q to Quit to Menu", (200, 200, 200), instruction_font)
         quit_rect = quit_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40))
         screen.blit(quit_text, quit_rect)
         
         # Display session stats
         stats_y = SCREEN_HEIGHT // 2 + 100
-        score_text = instruction_font.render(f"Score: {self.score}", True, (255, 255, 255))
+        score_text = self.render_hud_text("pause_score", f"Score: {self.score}", (255, 255, 255), instruction_font)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, stats_y))
         screen.blit(score_text, score_rect)
         
-        coins_text = instruction_font.render(f"Session Coins: {self.economy.session_coins_earned}", True, (255, 215, 0))
+        coins_text = self.render_hud_text("pause_coins", f"Session Coins: {self.economy.session_coins_earned}", (255, 215, 0), instruction_font)
         coins_rect = coins_text.get_rect(center=(SCREEN_WIDTH // 2, stats_y + 30))
         screen.blit(coins_text, coins_rect)
 
@@ -1310,10 +1342,9 @@ class Game:
         """Display victory message if all aliens destroyed and advance to next level"""
         if self.all_aliens_destroyed() and not self.level_just_completed:
             # Check if there are more levels
-            max_level = max(Level.level_dict.keys())
             current_level = Level.current_level_index
             
-            if current_level < max_level:
+            if current_level < Level.max_level:
                 # Mark level as completed
                 self.level_just_completed = True
                 self.level_complete_counter = 180  # Show message for ~3 seconds at 60 FPS
@@ -1332,6 +1363,8 @@ class Game:
 
                 # Save earned coins to wallet immediately so they persist
                 self.economy.save_session_coins()
+                if self.wallet_sync_pending:
+                    self.flush_wallet_sync(force=True)
                 
                 # Reset key/chest state for the new level. Unused keys don't
                 # carry over so each level is self-contained on the loot loop.
@@ -1346,22 +1379,21 @@ class Game:
                 
         # Display level complete message if timer is active
         if self.level_just_completed:
-            max_level = max(Level.level_dict.keys())
-            if Level.current_level_index <= max_level:
+            if Level.current_level_index <= Level.max_level:
                 completed_level = Level.current_level_index
                 starting_level = Level.current_level_index + 1
-                level_text = self.font.render(f"LEVEL {completed_level} COMPLETE! LEVEL {starting_level} STARTING!", True, (255, 255, 0))
+                level_text = self.render_text(f"LEVEL {completed_level} COMPLETE! LEVEL {starting_level} STARTING!", (255, 255, 0))
                 text_rect = level_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 30))
                 screen.blit(level_text, text_rect)
                 
                 # Display bonus coins earned
-                bonus_text = self.font.render(f"+{self.level_bonus_earned} GOLD COIN BONUS!", True, (255, 215, 0))
+                bonus_text = self.render_text(f"+{self.level_bonus_earned} GOLD COIN BONUS!", (255, 215, 0))
                 bonus_rect = bonus_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 10))
                 screen.blit(bonus_text, bonus_rect)
 
                 # Display health restored
             if hasattr(self, 'health_restored') and self.health_restored > 0:
-                health_text = self.font.render(f"+{self.health_restored} HEALTH RESTORED!", True, (0, 255, 0))
+                health_text = self.render_text(f"+{self.health_restored} HEALTH RESTORED!", (0, 255, 0))
                 health_rect = health_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
                 screen.blit(health_text, health_rect)
             
@@ -1371,8 +1403,7 @@ class Game:
                 self.level_bonus_earned = 0  # Reset bonus after display
         elif self.all_aliens_destroyed():
             # All levels completed - final victory
-            max_level = max(Level.level_dict.keys())
-            if Level.current_level_index >= max_level:
+            if Level.current_level_index >= Level.max_level:
                 # Award final level bonus if not already awarded
                 if self.level_bonus_earned == 0:
                     self.level_bonus_earned = 50 * (2 ** Level.current_level_index)
@@ -1380,12 +1411,12 @@ class Game:
                     # Save earned coins to wallet immediately
                     self.economy.save_session_coins()
                 
-                victory_text = self.font.render("VICTORY! ALL LEVELS COMPLETE!", True, (255, 255, 0))
+                victory_text = self.render_text("VICTORY! ALL LEVELS COMPLETE!", (255, 255, 0))
                 text_rect = victory_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
                 screen.blit(victory_text, text_rect)
                 
                 # Display final bonus
-                bonus_text = self.font.render(f"+{self.level_bonus_earned} BONUS COINS!", True, (255, 215, 0))
+                bonus_text = self.render_text(f"+{self.level_bonus_earned} BONUS COINS!", (255, 215, 0))
                 bonus_rect = bonus_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40))
                 screen.blit(bonus_text, bonus_rect)
 
@@ -1418,34 +1449,34 @@ class Game:
         self.treasure_chests.update()
         self.keys.update()
         self.collect_chests_to_wallet()
+        self.flush_wallet_sync()
 
         
         self.alien_position_checker()
         self.extra_alien_timer()
-        self.remove_offscreen_aliens()  # Remove aliens that passed below the screen
+        # Aliens that pass below the screen are killed where they move:
+        # AlienFleet.drop() for the formation, update() for diagonals/divers.
         
         game_continues = self.collision_checks()
         if not game_continues:
             return False
         
-        self.player.sprite.lasers.draw(screen)
-        self.player.draw(screen)
-        self.blocks.draw(screen)
-        
-        # Draw all alien types
-        self.aliens.draw(screen)  # Type 1
-        self.diagonal_aliens.draw(screen)  # Type 2
-        self.diver_aliens.draw(screen)  # Type 3
-        
-        # Draw mystery ship
-        self.mystery_ship.draw(screen)
-        
-        # Draw treasure chests and keys
-        self.treasure_chests.draw(screen)
-        self.keys.draw(screen)
-        
-        # Removed alien_lasers.draw() - aliens don't shoot
-        self.extra.draw(screen)
+        # Lasers, player, all alien types, mystery ship, treasure chests, keys
+        # and extras go out in one batched blit, back to front. Obstacles are
+        # part of the static layer main() blits as the background.
+        # Removed alien_lasers - aliens don't shoot
+        self.draw_groups(
+            screen,
+            self.player.sprite.lasers,
+            self.player,
+            self.aliens,
+            self.diagonal_aliens,
+            self.diver_aliens,
+            self.mystery_ship,
+            self.treasure_chests,
+            self.keys,
+            self.extra,
+        )
         self.display_score()
         self.display_coins()
         self.display_level()
@@ -1479,7 +1510,7 @@ class Game:
             if self.wallet_button.check_input(mouse_pos):
                 self.show_wallet_panel = not self.show_wallet_panel
                 if self.show_wallet_panel:
-                    self.economy.sync_wallet()
+                    self.flush_wallet_sync(force=True)
             # Handle clicks on treasure chests inside the wallet panel
             if self.show_wallet_panel and hasattr(self, 'wallet_chest_rects'):
                 for i, rect in enumerate(self.wallet_chest_rects):
@@ -1558,6 +1589,8 @@ async def main():
                     # Q while paused = quit to menu
                     # Save session coins before quitting
                     game.economy.save_session_coins()
+                    if game.wallet_sync_pending:
+                        game.flush_wallet_sync(force=True)
                     from mainMenu import main_menu
                     return await main_menu(main)
                 elif event.key == pygame.K_m:
@@ -1566,19 +1599,21 @@ async def main():
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_clicked = True
 
-        # Draw background using current theme
-        screen.blit(game.get_current_background(), (0, 0))
+        # Draw background using current theme (obstacles pre-composited)
+        screen.blit(game.get_static_layer(), (0, 0))
         # Renders the title of the game on the screen
         screen.blit(title_surface, title_rect)
 
         # Handle pause state
         if game.is_paused:
             # Still draw game state in background, then overlay pause screen
-            game.player.draw(screen)
-            game.blocks.draw(screen)
-            game.aliens.draw(screen)
-            game.diagonal_aliens.draw(screen)
-            game.diver_aliens.draw(screen)
+            game.draw_groups(
+                screen,
+                game.player,
+                game.aliens,
+                game.diagonal_aliens,
+                game.diver_aliens,
+            )
             game.display_score()
             game.display_coins()
             game.display_level()
@@ -1607,6 +1642,8 @@ async def main():
             elif not game_result:
                 # Game over screen - save coins before ending
                 game.economy.save_session_coins()
+                if game.wallet_sync_pending:
+                    game.flush_wallet_sync(force=True)
                 game_over_text = font.render("GAME OVER", True, (255, 0, 0))
                 text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
                 screen.blit(game_over_text, text_rect)
@@ -1,20 +1,46 @@
 import pygame, random, os
+from types import MappingProxyType
 from config import SCREEN_WIDTH, SCREEN_HEIGHT, resource_path
+from image_cache import cached_surface, load_image
 
 
-aliens = pygame.sprite.Group()
+# Spawn-roll generator for the aliens and Game's spawn timers, kept apart
+# from the global random state
+RNG = random.Random()
 
-def check_alien_edges(self, alien_group, direction):
-    """Check if any alien hits screen edge. Returns reversed direction if edge hit, otherwise returns same direction."""
-    edge_hit = False
-    for alien in alien_group:
-        if alien.rect.left <= 0 or alien.rect.right >= SCREEN_WIDTH:
-            edge_hit = True
-            break
-    
-    if edge_hit:
-        return -direction  # Reverse direction
-    return direction  # Keep same direction
+
+class AlienFleet(pygame.sprite.Group):
+    """
+    Group for the type 1 formation. ``update(direction)`` steps every alien
+    with ``Alien.update_horizontal`` and records whether any of them reached a
+    screen edge, so the game does not rescan the formation for it.
+    """
+    def __init__(self, *sprites):
+        super().__init__(*sprites)
+        self.edge_hit = False
+
+    def update(self, direction=None):
+        if direction is None:
+            super().update()
+            return
+        edge_hit = False
+        for alien in self.sprites():
+            if alien.update_horizontal(direction):
+                edge_hit = True
+        self.edge_hit = edge_hit
+
+    def drop(self, distance):
+        """
+        Move the whole formation down by ``distance`` pixels.
+
+        This is the only place formation aliens move vertically, so aliens
+        pushed below the screen are removed here rather than by a per-frame scan.
+        """
+        for alien in self.sprites():
+            rect = alien.rect
+            rect.y += distance
+            if rect.top > SCREEN_HEIGHT:
+                alien.kill()
 
 
 class Alien(pygame.sprite.Sprite):
@@ -26,8 +52,7 @@ class Alien(pygame.sprite.Sprite):
         super().__init__()
         self.type = type
         self.health = 100  # default health for all aliens
-        path = resource_path("assets", f"alien_{type}.png")
-        self.image = pygame.image.load(path)
+        self.image = Alien.get_image(type)
         self.rect = self.image.get_rect(center=(x, y))
         self.value = 100  # default value for all aliens
         self.speed = speed
@@ -39,12 +64,12 @@ class Alien(pygame.sprite.Sprite):
     def update(self, direction=None):
         """Update alien position. If direction is provided, move horizontally."""
         if direction is not None:
-            self.pos_x += direction * self.speed
-            self.rect.x = int(self.pos_x)
+            self.update_horizontal(direction)
         else:
             # Default vertical movement (for backward compatibility)
-            self.rect.y += 2
-            if self.rect.top > SCREEN_HEIGHT:
+            y = self.rect.y + 2
+            self.rect.y = y
+            if y > SCREEN_HEIGHT:
                 self.kill()
 
     def update_horizontal(self, direction):
@@ -57,19 +82,35 @@ class Alien(pygame.sprite.Sprite):
             return True  # Signal that edge was hit
         return False
 
-    # Spawn timer variables
-    SPAWN_INTERVAL = 2000  # milliseconds
-    last_spawn_time = pygame.time.get_ticks()
+    @classmethod
+    def get_image(cls, alien_type):
+        """Return the shared surface for ``alien_type``, loading it once."""
+        return load_image("assets", f"alien_{alien_type}.png")
+
+    @classmethod
+    def preload_images(cls):
+        """
+        Load, rotate and scale every alien surface up front (call once the
+        display is set) so the first diagonal/diver/mystery spawn does not
+        stall on disk I/O or a transform.
+        """
+        for alien_type in (1, 2, 3):
+            cls.get_image(alien_type)
+        AlienDiver.get_image()
+        MysteryShip.get_image()
+
+    # Read-only alien type metadata, built once and shared by every caller
+    ALIEN_TYPES = MappingProxyType({
+        1: MappingProxyType({'file': 'alien_1.png', 'movement': 'horizontal', 'description': 'Standard formation alien'}),
+        2: MappingProxyType({'file': 'alien_2.png', 'movement': 'diagonal', 'description': 'Diagonal movement alien'}),
+        3: MappingProxyType({'file': 'alien_3.png', 'movement': 'dive', 'description': 'Diving alien (flipped, moves straight down)'}),
+        4: MappingProxyType({'file': 'mystery.png', 'movement': 'horizontal-fast', 'description': 'periodically moves across the top of the screen horizontally and quickly.'}),
+    })
 
     @staticmethod
     def get_alien_types():
         """Returns available alien type information"""
-        return {
-            1: {'file': 'alien_1.png', 'movement': 'horizontal', 'description': 'Standard formation alien'},
-            2: {'file': 'alien_2.png', 'movement': 'diagonal', 'description': 'Diagonal movement alien'},
-            3: {'file': 'alien_3.png', 'movement': 'dive', 'description': 'Diving alien (flipped, moves straight down)'},
-            4: {'file': 'mystery.png', 'movement': 'horizontal-fast', 'description': 'periodically moves across the top of the screen horizontally and quickly.'}
-        }
+        return Alien.ALIEN_TYPES
 
 
 class AlienDiagonal(pygame.sprite.Sprite):
@@ -81,8 +122,7 @@ class AlienDiagonal(pygame.sprite.Sprite):
         super().__init__()
         self.type = 2
         self.health = 100
-        path = resource_path("assets", "alien_2.png")
-        self.image = pygame.image.load(path)
+        self.image = Alien.get_image(2)
         self.rect = self.image.get_rect(center=(x, y))
         self.value = 150  # Higher value for harder alien
         self.speed = speed
@@ -109,10 +149,11 @@ class AlienDiagonal(pygame.sprite.Sprite):
             self.horizontal_direction = -1
 
         self.pos_y += self.vertical_speed
-        self.rect.y = int(self.pos_y)
+        y = int(self.pos_y)
+        self.rect.y = y
 
-        # Remove if off screen
-        if self.rect.top > SCREEN_HEIGHT:
+        # Remove if off screen (rect.top is the y just written)
+        if y > SCREEN_HEIGHT:
             self.kill()
 
 
@@ -125,10 +166,7 @@ class AlienDiver(pygame.sprite.Sprite):
         super().__init__()
         self.type = 3
         self.health = 100
-        path = resource_path("assets", "alien_3.png")
-        original_image = pygame.image.load(path)
-        # Flip the image 180 degrees (both horizontally and vertically)
-        self.image = pygame.transform.rotate(original_image, 180)
+        self.image = AlienDiver.get_image()
         self.rect = self.image.get_rect(center=(x, y))
         self.value = 200  # Highest value for hardest alien
         self.base_speed = speed
@@ -141,12 +179,21 @@ class AlienDiver(pygame.sprite.Sprite):
     def update(self, direction=None):
         """Move straight down at level-based speed."""
         self.pos_y += self.speed
-        self.rect.y = int(self.pos_y)
+        y = int(self.pos_y)
+        self.rect.y = y
 
-        # Remove if off screen
-        if self.rect.top > SCREEN_HEIGHT:
+        # Remove if off screen (rect.top is the y just written)
+        if y > SCREEN_HEIGHT:
             self.kill()
     
+    @classmethod
+    def get_image(cls):
+        """Return the shared diver surface (alien_3 flipped 180 degrees)."""
+        return cached_surface(
+            "assets/alien_3.png#rot180",
+            lambda: pygame.transform.rotate(Alien.get_image(3), 180),
+        )
+
     def set_level_speed(self, level):
         """Update speed based on current level."""
         self.level_multiplier = level
@@ -157,25 +204,36 @@ class MysteryShip(pygame.sprite.Sprite):
     """Mystery ship that flies across the screen for bonus points. Uses assets/mystery.png image."""
     def __init__(self, x, y, scale_size=(60, 50)):
         super().__init__()
-        path = resource_path("assets", "mystery.png")
-        
-        # Load and scale the mystery ship image
-        if os.path.exists(path):
-            original_image = pygame.image.load(path).convert_alpha()
-            self.image = pygame.transform.scale(original_image, scale_size)
-        else:
-            # Fallback to a red rectangle if image doesn't exist
-            self.image = pygame.Surface(scale_size, pygame.SRCALPHA)
-            self.image.fill((255, 0, 0))  # Red color
-            print(f"Warning: Could not load mystery ship image from {path}")
+        # Scaled once per size and shared by every mystery ship
+        self.image = MysteryShip.get_image(scale_size)
         
         self.rect = self.image.get_rect(topleft=(x, y))
         self.health = 150  # 3 hits to destroy (each hit does 50 damage)
         self.speed = 3
         self.value = 500
-        self.direction = random.choice([-1, 1])  # Randomize direction: -1 = left, 1 = right
+        self.direction = RNG.choice((-1, 1))  # Randomize direction: -1 = left, 1 = right
         self.hits_taken = 0  # Track number of hits for debugging
 
+    @staticmethod
+    def get_image(scale_size=(60, 50)):
+        """Return the mystery ship surface scaled to ``scale_size`` (scaled once per size)."""
+        return cached_surface(
+            f"assets/mystery.png@{scale_size[0]}x{scale_size[1]}",
+            lambda: MysteryShip.build_image(scale_size),
+        )
+
+    @staticmethod
+    def build_image(scale_size):
+        """Load and scale the mystery ship image (red rectangle if it is missing)."""
+        path = resource_path("assets", "mystery.png")
+        if os.path.exists(path):
+            return pygame.transform.scale(load_image("assets", "mystery.png"), scale_size)
+        # Fallback to a red rectangle if image doesn't exist
+        image = pygame.Surface(scale_size, pygame.SRCALPHA)
+        image.fill((255, 0, 0))  # Red color
+        print(f"Warning: Could not load mystery ship image from {path}")
+        return image
+
     def update(self, direction=None):
         """Move horizontally across screen."""
         # Use instance direction if none provided
@@ -0,0 +1,40 @@
+"""
+Warm the image and sound caches while the main menu is on screen.
+
+Pygbag has no threads, so prefetching is cooperative: the menu loop calls
+prefetch_step() once per frame and each call decodes a single asset into
+IMAGE_CACHE / SOUND_CACHE. By the time PLAY is clicked, Game() and the first
+spawns find every Surface and Sound already loaded.
+"""
+from alien import Alien, AlienDiver, MysteryShip
+from laser import Laser
+from sound_cache import load_sound
+from treasureChest import Key, TreasureChest
+
+
+PREFETCH_STEPS = [
+    lambda: Alien.get_image(1),
+    lambda: Alien.get_image(2),
+    lambda: Alien.get_image(3),
+    AlienDiver.get_image,
+    MysteryShip.get_image,
+    TreasureChest.get_image,
+    Key.get_image,
+    Laser.get_image,
+    lambda: load_sound("audio", "music.wav"),
+    lambda: load_sound("audio", "audio_laser.ogg"),
+    lambda: load_sound("audio", "explosion.wav"),
+]
+
+
+def prefetch_step():
+    """Load the next pending asset; return False once nothing is left."""
+    if not PREFETCH_STEPS:
+        return False
+    step = PREFETCH_STEPS.pop(0)
+    try:
+        step()
+    except Exception as e:
+        # Game() has its own fallbacks; a miss here only costs the warm-up
+        print(f"⚠️ Prefetch skipped an asset: {e}")
+    return bool(PREFETCH_STEPS)
@@ -7,6 +7,17 @@ import sys
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
+# Desktop windows ask SDL for vsync so display.flip() paces frames to the
+# monitor; clock.tick(60) stays as the upper cap. Set GAME_VSYNC=0 to disable.
+DISPLAY_VSYNC = os.getenv("GAME_VSYNC", "1") != "0"
+
+
+# Resolved once: desktop asset paths are joined onto this directory.
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+# Browser lookups that found an existing file; misses are not cached since
+# the virtual FS may not be mounted yet.
+RESOLVED_BROWSER_PATHS: dict[str, str] = {}
+
 
 def resource_path(*parts: str) -> str:
     """
@@ -21,6 +32,9 @@ def resource_path(*parts: str) -> str:
         # - /data/data/<bundle>
         # Probe common relative candidates so asset loading is resilient.
         normalized = path.lstrip("./")
+        resolved = RESOLVED_BROWSER_PATHS.get(normalized)
+        if resolved is not None:
+            return resolved
         candidates = [normalized]
         candidates.append(f"assets/{normalized}")
         if normalized.startswith("assets/"):
@@ -33,14 +47,14 @@ def resource_path(*parts: str) -> str:
             seen.add(candidate)
             try:
                 if os.path.exists(candidate):
+                    RESOLVED_BROWSER_PATHS[normalized] = candidate
                     return candidate
             except Exception:
                 # In browser runtimes, probing may fail before FS mount.
                 pass
         return normalized
     # Desktop: resolve relative to config file (game dir)
-    base = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(base, path)
+    return os.path.join(GAME_DIR, path)
 
 # Free currency (earned through gameplay)
 INITIAL_COINS = 0
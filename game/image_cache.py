@@ -0,0 +1,54 @@
+"""
+Load-once Surfaces shared by every sprite that draws the same image.
+
+Blits only read from ``sprite.image``, so aliens, keys and mystery ships of one
+kind can all point at a single decoded (and converted) Surface instead of
+hitting the disk and allocating a fresh copy per spawn. Sprites that mutate
+their image (e.g. ``set_alpha`` for a fade) must ``copy()`` what they get here.
+"""
+import pygame
+
+from config import SCREEN_HEIGHT, SCREEN_WIDTH, resource_path
+
+
+IMAGE_CACHE: dict[str, pygame.Surface] = {}
+
+
+def load_image(*parts):
+    """
+    Return the Surface for the asset at ``resource_path(*parts)``, loading it once.
+
+    The image is ``convert_alpha()``-ed when a display mode is already set;
+    before that it is kept as loaded.
+    """
+    key = "/".join(parts)
+    image = IMAGE_CACHE.get(key)
+    if image is None:
+        image = pygame.image.load(resource_path(*parts))
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        IMAGE_CACHE[key] = image
+    return image
+
+
+def load_background(path):
+    """
+    Return the image at ``path`` scaled to the screen size, loading it once.
+
+    The menu and the game share these full-screen Surfaces. They are opaque,
+    so ``convert()`` is used to get a display-format copy without per-pixel
+    alpha.
+    """
+    return cached_surface(
+        f"{path}@{SCREEN_WIDTH}x{SCREEN_HEIGHT}",
+        lambda: pygame.transform.scale(pygame.image.load(path).convert(), (SCREEN_WIDTH, SCREEN_HEIGHT)),
+    )
+
+
+def cached_surface(key, build):
+    """Memoize a derived Surface (scaled, rotated, fallback...) under ``key``."""
+    image = IMAGE_CACHE.get(key)
+    if image is None:
+        image = build()
+        IMAGE_CACHE[key] = image
+    return image
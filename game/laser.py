@@ -1,17 +1,31 @@
 import pygame
 
+from image_cache import cached_surface
+
 # from game import spaceship
 
 class Laser(pygame.sprite.Sprite):
     def __init__(self, position, speed, screen_height, false):
         super().__init__()
-        self.image = pygame.Surface((4, 20))
-        self.image.fill((243, 216, 63))
+        # Every bolt shares one pre-filled surface instead of allocating its own
+        self.image = Laser.get_image()
         self.rect = self.image.get_rect(center=position)
         self.speed = speed
         self.screen_y_axis = screen_height
         self.laser = False
 
+    @staticmethod
+    def get_image():
+        """Return the shared 4x20 yellow laser surface."""
+        return cached_surface("laser#4x20", Laser.build_image)
+
+    @staticmethod
+    def build_image():
+        """Create the laser surface (a solid yellow bolt)."""
+        image = pygame.Surface((4, 20))
+        image.fill((243, 216, 63))
+        return image
+
     def destroy(self):
         if self.rect.y <= -50 or self.rect.y >= self.screen_y_axis + 50:
             self.kill()
@@ -1,23 +1,46 @@
 import asyncio  # Required for Pygbag web deployment
+import functools
 import sys
 import pygame
 import os
 from button import Button
-from config import SCREEN_WIDTH, SCREEN_HEIGHT, DEFAULT_BACKGROUND_THEME, resource_path
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, DEFAULT_BACKGROUND_THEME, DISPLAY_VSYNC, resource_path, running_in_browser
+from image_cache import load_background
+from asset_prefetch import prefetch_step
 
 # Initialize pygame
 pygame.init()
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
+def open_display(caption):
+    """
+    Create the game window and return its Surface.
+
+    On desktop the window is SCALED with vsync when DISPLAY_VSYNC is set,
+    falling back to a plain window if the driver refuses vsync. The browser
+    is already paced by requestAnimationFrame, so pygbag keeps the plain mode.
+    """
+    size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    if DISPLAY_VSYNC and not running_in_browser():
+        try:
+            pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+        except pygame.error as e:
+            print(f"⚠️ VSync unavailable ({e}); using a plain window")
+            pygame.display.set_mode(size)
+    else:
+        pygame.display.set_mode(size)
+    pygame.display.set_caption(caption)
+    return pygame.display.get_surface()
+
+
 # Screen setup - use get_surface() at runtime so we draw to the active display
 # (__main__.py may recreate the display; drawing to a stale SCREEN causes blank screen)
 def get_screen():
     surf = pygame.display.get_surface()
     if surf is None:
-        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Space Cowboys🚀 - Main Menu")
-    return pygame.display.get_surface()
+        return open_display("Space Cowboys🚀 - Main Menu")
+    return surf
 
 
 # Theme management
@@ -41,9 +64,7 @@ class ThemeManager:
         nebula_bg_path = DEFAULT_BACKGROUND_THEME
         if os.path.exists(nebula_bg_path):
             try:
-                nebula_bg_img = pygame.image.load(nebula_bg_path).convert()
-                nebula_bg = pygame.transform.scale(nebula_bg_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                self.themes.append(("Purple Nebula", nebula_bg))
+                self.themes.append(("Purple Nebula", load_background(nebula_bg_path)))
             except pygame.error:
                 print(f"Warning: Could not load {nebula_bg_path}")
         
@@ -56,9 +77,7 @@ class ThemeManager:
         menu_bg_path = resource_path("assets", "main_menu_background.png")
         if os.path.exists(menu_bg_path):
             try:
-                menu_bg_img = pygame.image.load(menu_bg_path).convert()
-                menu_bg = pygame.transform.scale(menu_bg_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                self.themes.append(("Menu Background", menu_bg))
+                self.themes.append(("Menu Background", load_background(menu_bg_path)))
             except pygame.error:
                 print(f"Warning: Could not load {menu_bg_path}")
     
@@ -88,8 +107,9 @@ class ThemeManager:
 # Create global theme manager instance
 theme_manager = ThemeManager()
 
+@functools.lru_cache(maxsize=None)
 def get_font(size):
-    """Font size function"""
+    """Font size function; each size is opened once and reused every frame"""
     font_path = resource_path("assets", "Fonts", "hyperspace", "Hyperspace Bold Italic.otf")
     try:
         return pygame.font.Font(font_path, size)
@@ -168,8 +188,9 @@ async def main_menu(start_game_callback=None):
                             except Exception:
                                 from main import main as start_game_callback
                         await start_game_callback()  # Await async game function
-                        # Ensures display is still active after game returns
-                        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+                        # Ensures display is still active after game returns;
+                        # only recreates the window if it is actually gone
+                        get_screen()
                         pygame.display.set_caption("Space Cowboys🚀 - Main Menu")
                     except Exception as e:
                         print(f"Error starting game: {e}")
@@ -187,6 +208,8 @@ async def main_menu(start_game_callback=None):
                     sys.exit()
         
         pygame.display.update()
+        # Decode one game asset per menu frame so PLAY starts from warm caches
+        prefetch_step()
         clock.tick(60)
         await asyncio.sleep(0)  # Yield control to browser (required for Pygbag)
 
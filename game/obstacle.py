@@ -1,5 +1,4 @@
-import pygame, sys
-from player import Player
+import pygame
 from config import SCREEN_HEIGHT, SCREEN_WIDTH
 
 # obstacle (asteroid) class 
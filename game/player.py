@@ -1,10 +1,10 @@
 
 import pygame
-import sys
 import os
 from pygame.locals import * #For useful variables
 from laser import Laser
 from config import resource_path
+from sound_cache import load_sound
 
 # Get absolute paths for assets
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,7 +22,7 @@ class Player(pygame.sprite.Sprite):
 		self.laser_cooldown = 600
 		self.lasers = pygame.sprite.Group()
 		try:
-			self.laser_sound = pygame.mixer.Sound(resource_path("audio", "audio_laser.ogg"))
+			self.laser_sound = load_sound("audio", "audio_laser.ogg")
 			self.laser_sound.set_volume(0.5)
 		except Exception as e:
 			print(f"Warning: Could not load laser sound: {e}")
@@ -61,16 +61,9 @@ class Player(pygame.sprite.Sprite):
 	# 'margin' constraints for setting boundaries for where the player can move to 
 	def constraint(self):
 		from config import SCREEN_HEIGHT
-		# Left/Right boundaries
-		if self.rect.left <= 0:
-			self.rect.left = 0
-		if self.rect.right >= self.max_x_constraint:
-			self.rect.right = self.max_x_constraint
-		# Top/Bottom boundaries
-		if self.rect.top <= 0:
-			self.rect.top = 0
-		if self.rect.bottom >= SCREEN_HEIGHT:
-			self.rect.bottom = SCREEN_HEIGHT
+		# Left/Right (0..max_x_constraint) and Top/Bottom (0..SCREEN_HEIGHT)
+		# boundaries in one clamp instead of four compare-and-assign branches
+		self.rect.clamp_ip((0, 0, self.max_x_constraint, SCREEN_HEIGHT))
         
 	def shoot_laser(self):
 		from config import SCREEN_HEIGHT
@@ -0,0 +1,23 @@
+"""
+Load-once Sounds shared by every Game and Player instance.
+
+Starting a new game from the menu builds a fresh Game (and Player); without
+this cache each one re-read and re-decoded the same music, laser and explosion
+files. Callers still set their own volume after fetching a Sound.
+"""
+import pygame
+
+from config import resource_path
+
+
+SOUND_CACHE: dict[str, pygame.mixer.Sound] = {}
+
+
+def load_sound(*parts):
+    """Return the Sound for the file at ``resource_path(*parts)``, decoding it once."""
+    key = "/".join(parts)
+    sound = SOUND_CACHE.get(key)
+    if sound is None:
+        sound = pygame.mixer.Sound(resource_path(*parts))
+        SOUND_CACHE[key] = sound
+    return sound
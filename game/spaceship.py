@@ -4,17 +4,18 @@ import sys
 
 import pygame
 from config import resource_path, BACKEND_API_URL
+from image_cache import load_image
 from web_http import fetch_json, kick_off_background_json
 
 IS_BROWSER = sys.platform == "emscripten"
+# player_id.json lives in the repo root, one level above game/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 class SpaceShip(pygame.sprite.Sprite):
     def __init__(self, x, y, health=10):
         super().__init__()
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        self.image = pygame.image.load(resource_path("assets", "spaceship.png"))
+        self.image = load_image("assets", "spaceship.png")
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
         self.health = health
@@ -24,7 +25,7 @@ class SpaceShip(pygame.sprite.Sprite):
         # localStorage (populated by the fallback load_shared_player_id in
         # __main__.py so all modules agree on the same UUID).
         self.player_wallet_id = (
-            self.load_browser_player_id() if IS_BROWSER else self.load_player_id(project_root)
+            self.load_browser_player_id() if IS_BROWSER else self.load_player_id(PROJECT_ROOT)
         )
         self.gold_coins = 0
         self.wallet_last_fetched = 0
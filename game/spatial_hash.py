@@ -0,0 +1,54 @@
+"""
+Uniform-grid index of sprites for rect hit tests.
+
+The game keeps one over all alien groups (rebuilt every frame) and one over
+the obstacle blocks (rebuilt when obstacles are created). Each laser then
+checks only the sprites sharing its grid cells instead of every sprite on
+screen.
+"""
+
+
+class SpatialHash:
+    """Bucket sprites with a ``rect`` into ``cell``-pixel grid cells."""
+    def __init__(self, cell=64):
+        self.cell = cell
+        self.buckets = {}
+
+    def rebuild(self, *groups):
+        cell = self.cell
+        buckets = self.buckets
+        buckets.clear()
+        for group in groups:
+            for sprite in group:
+                rect = sprite.rect
+                for cx in range(rect.left // cell, rect.right // cell + 1):
+                    for cy in range(rect.top // cell, rect.bottom // cell + 1):
+                        bucket = buckets.get((cx, cy))
+                        if bucket is None:
+                            buckets[(cx, cy)] = [sprite]
+                        else:
+                            bucket.append(sprite)
+
+    def get_near_rect(self, rect):
+        """Sprites in any cell that ``rect`` overlaps (may include non-colliding ones)."""
+        cell = self.cell
+        buckets = self.buckets
+        near = set()
+        for cx in range(rect.left // cell, rect.right // cell + 1):
+            for cy in range(rect.top // cell, rect.bottom // cell + 1):
+                bucket = buckets.get((cx, cy))
+                if bucket:
+                    near.update(bucket)
+        return near
+
+    def collide(self, sprite, dokill=False):
+        """``spritecollide`` equivalent that only tests nearby, still-alive sprites."""
+        rect = sprite.rect
+        hits = [
+            other for other in self.get_near_rect(rect)
+            if other.alive() and rect.colliderect(other.rect)
+        ]
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
@@ -1,3 +1,4 @@
+import math
 import pygame
 import os
 import random
@@ -7,6 +8,7 @@ from config import (
     TRESURE_CHEST_HEALTH_PACK_CHANCE, TREASURE_CHEST_MIN_HEALTH_PACK, TREASURE_CHEST_MAX_HEALTH_PACK,
     resource_path,
 )
+from image_cache import cached_surface, load_image
 
 
 class TreasureChest(pygame.sprite.Sprite):
@@ -21,13 +23,9 @@ class TreasureChest(pygame.sprite.Sprite):
 
     def __init__(self, x, y, scale_size=(80, 80), wallet_grace_ms=5000):
         super().__init__()
-        path = resource_path("assets", "treasure_chest.png")
-        if os.path.exists(path):
-            original_image = pygame.image.load(path).convert_alpha()
-            self.image = pygame.transform.scale(original_image, scale_size)
-        else:
-            self.image = pygame.Surface((40, 40))
-            self.image.fill((218, 165, 32))  # Gold color
+        # The scaled image is decoded once; each chest gets its own copy
+        # because the spawn fade calls set_alpha() on it.
+        self.image = TreasureChest.get_image(scale_size).copy()
         
         self.rect = self.image.get_rect(center=(x, y))
         self.locked = True
@@ -51,6 +49,23 @@ class TreasureChest(pygame.sprite.Sprite):
         self.wallet_grace_ms = wallet_grace_ms
         self.landed_at = None
 
+    @staticmethod
+    def get_image(scale_size=(80, 80)):
+        """Return the shared chest surface scaled to ``scale_size``; copy before mutating."""
+        return cached_surface(
+            f"assets/treasure_chest.png@{scale_size[0]}x{scale_size[1]}",
+            lambda: TreasureChest.build_image(scale_size),
+        )
+
+    @staticmethod
+    def build_image(scale_size):
+        """Load and scale the chest image (gold square if it is missing)."""
+        if os.path.exists(resource_path("assets", "treasure_chest.png")):
+            return pygame.transform.scale(load_image("assets", "treasure_chest.png"), scale_size)
+        image = pygame.Surface((40, 40))
+        image.fill((218, 165, 32))  # Gold color
+        return image
+
     def unlock(self):
         """Unlock the treasure chest and return its rewards."""
         if self.locked:
@@ -83,9 +98,10 @@ class TreasureChest(pygame.sprite.Sprite):
 
     def update(self):
         """Update treasure chest state with spawn animation."""
+        # One clock read per frame for the fade, landing and float timers
+        now = pygame.time.get_ticks()
         if self.is_spawning:
-            current_time = pygame.time.get_ticks()
-            elapsed = current_time - self.spawn_time
+            elapsed = now - self.spawn_time
             
             # Fade in effect
             if elapsed < self.spawn_animation_duration:
@@ -101,17 +117,18 @@ class TreasureChest(pygame.sprite.Sprite):
                 if self.rect.centery >= self.target_y:
                     self.rect.centery = self.target_y
                     self.is_spawning = False
-                    self.landed_at = pygame.time.get_ticks()
+                    self.landed_at = now
         
         # Floating animation when idle (locked and not spawning). The chest
         # hovers in-world during the grace window so the player can try to
         # grab it with a key before it gets stashed in the wallet.
         if not self.is_spawning and self.locked and not self.ready_for_wallet:
-            float_offset = int(3 * pygame.math.Vector2(0, 1).rotate(pygame.time.get_ticks() * 0.1).y)
+            # Same bob as rotating (0, 1) by now * 0.1 degrees, without a Vector2
+            float_offset = int(3 * math.cos(math.radians(now * 0.1)))
             self.rect.centery = self.target_y + float_offset
 
             if self.landed_at is not None:
-                elapsed_since_land = pygame.time.get_ticks() - self.landed_at
+                elapsed_since_land = now - self.landed_at
                 if elapsed_since_land >= self.wallet_grace_ms:
                     self.ready_for_wallet = True
         
@@ -127,13 +144,7 @@ class Key(pygame.sprite.Sprite):
     """
     def __init__(self, x, y):
         super().__init__()
-        path = resource_path("assets", "key.png")
-        if os.path.exists(path):
-            self.image = pygame.image.load(path).convert_alpha()
-        else:
-            # Fallback to a colored rectangle if image doesn't exist
-            self.image = pygame.Surface((20, 30))
-            self.image.fill((255, 215, 0))  # Gold color
+        self.image = Key.get_image()
         
         self.rect = self.image.get_rect(center=(x, y))
         self.collected = False
@@ -144,6 +155,21 @@ class Key(pygame.sprite.Sprite):
         self.display_duration = 3000  # 3 seconds in milliseconds
         self.is_active = True
 
+    @staticmethod
+    def get_image():
+        """Return the shared key surface."""
+        return cached_surface("assets/key.png#sprite", Key.build_image)
+
+    @staticmethod
+    def build_image():
+        """Load the key image (gold rectangle if it is missing)."""
+        if os.path.exists(resource_path("assets", "key.png")):
+            return load_image("assets", "key.png")
+        # Fallback to a colored rectangle if image doesn't exist
+        image = pygame.Surface((20, 30))
+        image.fill((255, 215, 0))  # Gold color
+        return image
+
     @classmethod
     def spawn_from_mystery_ship(cls, mystery_ship_rect):
         """
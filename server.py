@@ -42,17 +42,25 @@ from __future__ import annotations
 
 from starlette.websockets import WebSocket
 import uuid
+from dataclasses import asdict, dataclass, field
 from typing import Optional
 from datetime import datetime
 
 from fastapi import Depends, FastAPI, HTTPException, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session, joinedload
 import os
 import mimetypes
+import atexit
+import logging
+import queue
+import threading
+import weakref
 
 # Register MIME types for pygbag files
 mimetypes.add_type("application/zip", ".apk")
@@ -61,14 +69,46 @@ mimetypes.add_type("application/javascript", ".js")
 
 # Import payment models and services (from backend_apis package)
 from backend_apis.models import PackageType, PACKAGES, PlayerIPRecord, TransactionStatus, Player, PlayerWallet
-from backend_apis.stripe_service import StripePaymentService
-from backend_apis.database import get_db, init_db, SessionLocal
+from backend_apis.stripe_service import StripePaymentService, close_stripe_http_client
+from backend_apis.database import get_db, init_db, pool_status, SessionLocal
+from backend_apis.stripe_payment_handler import record_event_once
 
 # web socket (WS) implementation imports for persistent connection between pygbag server and client
 from fastapi import WebSocket, WebSocketDisconnect
 from game.config import GAME_BUILD_PATH, PYGBAG_PORT
 import asyncio
 import json
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+# Request handlers log through a QueueHandler, so they never block on a stdout
+# write; a QueueListener thread does the actual I/O. Level comes from
+# LOG_LEVEL (default INFO).
+logger = logging.getLogger("game_server")
+
+
+def configure_logging() -> QueueListener:
+    """Attach a queue-backed handler to ``logger`` and start its listener."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    logger.handlers[:] = [QueueHandler(log_queue)]
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+log_listener = configure_logging()
+atexit.register(log_listener.stop)
 
 
 # ============================================================================
@@ -115,26 +155,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Player lists / game state repeat the same keys for every player and shrink
+# several-fold under gzip. Small bodies are left alone; level 4 keeps the CPU
+# cost low on frequently polled endpoints.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
 # ============================================================================
 # Step 3: In-Memory Data Storage
 # ============================================================================
 # Simple dictionaries for demo. In production, use a database.
 
+@dataclass(slots=True)
+class ConnectedPlayer:
+    """
+    Live state for one connected player.
+
+    Slotted so each record is a compact fixed-layout object rather than a
+    per-player dict, and field reads/writes are plain slot accesses.
+    """
+    name: str
+    x: float = 400
+    y: float = 300
+    score: int = 0
+    joined_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
 # Global storage for connected players
-# Key: player_id (str), Value: dict with player info (name, x, y, score, joined_at)
-connected_players: dict[str, dict] = {}
+# Key: player_id (str), Value: ConnectedPlayer (name, x, y, score, joined_at)
+connected_players: dict[str, ConnectedPlayer] = {}
 
 # Initialize Stripe service (uses environment variables)
 stripe_service = StripePaymentService()
 
 
+class PlayerLock:
+    """Weak-referenceable wrapper around ``threading.Lock`` (raw locks are not)."""
+
+    __slots__ = ("lock", "__weakref__")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        self.lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.lock.release()
+
+
+# Per-player locks serialize read-modify-write on a single player's wallet
+# while letting different players proceed in parallel. Sync endpoints run on
+# the threadpool, so these are thread locks; the async webhook hops onto the
+# threadpool before taking one. Entries disappear once nobody holds a lock.
+player_locks: "weakref.WeakValueDictionary[str, PlayerLock]" = weakref.WeakValueDictionary()
+player_locks_guard = threading.Lock()
+
+
+def get_player_lock(player_uuid: str) -> PlayerLock:
+    """Return the lock for ``player_uuid``, creating it on first use."""
+    with player_locks_guard:
+        lock = player_locks.get(player_uuid)
+        if lock is None:
+            lock = PlayerLock()
+            player_locks[player_uuid] = lock
+        return lock
+
+
 @app.on_event("startup")
 def bootstrap_database() -> None:
     """Create SQL tables (players, wallets, transactions, player_ip_records)."""
     try:
         init_db()
     except Exception as exc:  # pragma: no cover - startup diagnostics only
-        print(f"⚠️ Failed to initialize DB tables at startup: {exc}")
+        logger.warning("⚠️ Failed to initialize DB tables at startup: %s", exc)
+
+
+@app.on_event("shutdown")
+def release_stripe_connections() -> None:
+    """Close the pooled Stripe HTTP client so keep-alive sockets are not leaked."""
+    close_stripe_http_client()
 
 
 def extract_client_ip(http_request: Request) -> str:
@@ -217,11 +320,11 @@ class GameConnectionManager:
     async def connect(self, player_id: str, websocket: WebSocket):
         await websocket.accept()
         self.active_connections[player_id] = websocket
-        print(f"🔌 WebSocket connected: {player_id} (total: {len(self.active_connections)})")
+        logger.info("🔌 WebSocket connected: %s (total: %d)", player_id, len(self.active_connections))
 
     def disconnect(self, player_id: str):
         self.active_connections.pop(player_id, None)
-        print(f"🔌 WebSocket disconnected: {player_id} (total: {len(self.active_connections)})")
+        logger.info("🔌 WebSocket disconnected: %s (total: %d)", player_id, len(self.active_connections))
 
     async def send_personal(self, player_id: str, data: dict):
         ws = self.active_connections.get(player_id)
@@ -240,7 +343,7 @@ class GameConnectionManager:
         state = {
             "type": "game_state",
             "players": {
-                pid: {"name": p["name"], "x": p["x"], "y": p["y"], "score": p["score"]}
+                pid: {"name": p.name, "x": p.x, "y": p.y, "score": p.score}
                 for pid, p in connected_players.items()
             },
             "timestamp": datetime.now().isoformat(),
@@ -270,25 +373,20 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
     await ws_manager.connect(player_id, websocket)
 
     if player_id not in connected_players:
-        connected_players[player_id] = {
-            "name": f"Player_{player_id[:4]}",
-            "x": 400,
-            "y": 300,
-            "score": 0,
-            "joined_at": datetime.now().isoformat(),
-        }
+        connected_players[player_id] = ConnectedPlayer(name=f"Player_{player_id[:4]}")
+        mark_leaderboard_dirty()
 
     await ws_manager.send_personal(player_id, {
         "type": "welcome",
         "player_id": player_id,
-        "players": connected_players,
+        "players": {pid: p.to_dict() for pid, p in connected_players.items()},
         "pygbag_port": PYGBAG_PORT,
     })
 
     await ws_manager.broadcast({
         "type": "player_joined",
         "player_id": player_id,
-        "name": connected_players[player_id]["name"],
+        "name": connected_players[player_id].name,
     }, exclude=player_id)
 
     try:
@@ -297,23 +395,29 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
             msg_type = data.get("type")
 
             if msg_type == "position":
-                if player_id in connected_players:
-                    connected_players[player_id]["x"] = data.get("x", 0)
-                    connected_players[player_id]["y"] = data.get("y", 0)
+                x = data.get("x", 0)
+                y = data.get("y", 0)
+                player = connected_players.get(player_id)
+                if player is not None:
+                    player.x = x
+                    player.y = y
                 await ws_manager.broadcast({
                     "type": "player_moved",
                     "player_id": player_id,
-                    "x": data.get("x", 0),
-                    "y": data.get("y", 0),
+                    "x": x,
+                    "y": y,
                 }, exclude=player_id)
 
             elif msg_type == "score":
-                if player_id in connected_players:
-                    connected_players[player_id]["score"] = data.get("score", 0)
+                new_score = data.get("score", 0)
+                player = connected_players.get(player_id)
+                if player is not None:
+                    player.score = new_score
+                    mark_leaderboard_dirty()
                 await ws_manager.broadcast({
                     "type": "score_update",
                     "player_id": player_id,
-                    "score": data.get("score", 0),
+                    "score": new_score,
                 })
 
             elif msg_type == "chat":
@@ -333,6 +437,7 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
         ws_manager.disconnect(player_id)
         if player_id in connected_players:
             del connected_players[player_id]
+            mark_leaderboard_dirty()
         await ws_manager.broadcast({
             "type": "player_left",
             "player_id": player_id,
@@ -342,22 +447,21 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
 
 # Serve the Pygbag game at /play
 # Note: pygbag builds require specific MIME types for .apk files (zip archives)
-print(f"📁 Game build path: {GAME_BUILD_PATH}")
-print(f"📁 Game build exists: {os.path.exists(GAME_BUILD_PATH)}")
+logger.info("📁 Game build path: %s", GAME_BUILD_PATH)
+logger.info("📁 Game build exists: %s", os.path.exists(GAME_BUILD_PATH))
 
 if os.path.exists(GAME_BUILD_PATH):
     # List files in the build directory for debugging
     try:
         files = os.listdir(GAME_BUILD_PATH)
-        print(f"📁 Game build files: {files}")
+        logger.info("📁 Game build files: %s", files)
     except Exception as e:
-        print(f"⚠️ Could not list game build files: {e}")
-        print(GAME_BUILD_PATH)
+        logger.warning("⚠️ Could not list game build files in %s: %s", GAME_BUILD_PATH, e)
     
     app.mount("/play", StaticFiles(directory=GAME_BUILD_PATH, html=True), name="game")
-    print("✅ Mounted pygbag game at /play")
+    logger.info("✅ Mounted pygbag game at /play")
 else:
-    print(f"⚠️ Game build not found at {GAME_BUILD_PATH}")
+    logger.warning("⚠️ Game build not found at %s", GAME_BUILD_PATH)
 
 # ============================================================================
 # Step 4: Pydantic Models (Request/Response Validation)
@@ -457,6 +561,7 @@ def health_check():
     return {
         "status": "healthy",
         "connected_players": len(connected_players),
+        "db_pool": pool_status(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -527,13 +632,8 @@ def player_join(
     """
     player_id = str(uuid.uuid4())[:8]
 
-    connected_players[player_id] = {
-        "name": request.player_name,
-        "x": 400,
-        "y": 300,
-        "score": 0,
-        "joined_at": datetime.now().isoformat(),
-    }
+    connected_players[player_id] = ConnectedPlayer(name=request.player_name)
+    mark_leaderboard_dirty()
 
     client_ip = extract_client_ip(http_request)
     user_agent = http_request.headers.get("user-agent")
@@ -546,9 +646,9 @@ def player_join(
             user_agent=user_agent,
         )
     except Exception as exc:  # pragma: no cover - never block join on logging
-        print(f"⚠️ Failed to record IP for {player_id} ({client_ip}): {exc}")
+        logger.warning("⚠️ Failed to record IP for %s (%s): %s", player_id, client_ip, exc)
 
-    print(f"🎮 Player joined: {request.player_name} (ID: {player_id}) from {client_ip}")
+    logger.info("🎮 Player joined: %s (ID: %s) from %s", request.player_name, player_id, client_ip)
 
     return PlayerJoinResponse(
         success=True,
@@ -580,21 +680,61 @@ def player_leave(player_id: str):
     if player_id not in connected_players:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    player_name = connected_players[player_id]["name"]
+    player_name = connected_players[player_id].name
     del connected_players[player_id]
+    mark_leaderboard_dirty()
     
-    print(f"👋 Player left: {player_name} (ID: {player_id})")
+    logger.info("👋 Player left: %s (ID: %s)", player_name, player_id)
     
     return {"success": True, "message": f"Goodbye, {player_name}!"}
 
 
+def dumps_json_bytes(obj) -> bytes:
+    """Serialize ``obj`` to compact JSON bytes (orjson when it is installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+# Players serialized per streamed chunk; keeps the chunk count (and the
+# per-chunk send overhead) flat as the roster grows.
+PLAYER_STREAM_BATCH = 256
+
+
+async def stream_players_json(players: list[tuple[str, ConnectedPlayer]], **fields):
+    """
+    Yield ``{<fields>, "players": {...}}`` as JSON chunks, one batch of
+    ``PLAYER_STREAM_BATCH`` players at a time.
+
+    ``players`` should be a snapshot (``list(connected_players.items())``) so
+    joins/leaves during the stream cannot mutate the dict mid-iteration.
+    The first bytes go out before the whole player map has been serialized.
+    Being async, StreamingResponse iterates it on the event loop instead of
+    hopping to the threadpool for every chunk.
+    """
+    head = b"{"
+    for key, value in fields.items():
+        head += dumps_json_bytes(key) + b":" + dumps_json_bytes(value) + b","
+    yield head + b'"players":{'
+
+    for start in range(0, len(players), PLAYER_STREAM_BATCH):
+        batch = b",".join(
+            dumps_json_bytes(pid) + b":" + dumps_json_bytes(data.to_dict())
+            for pid, data in players[start:start + PLAYER_STREAM_BATCH]
+        )
+        yield (b"," if start else b"") + batch
+
+    yield b"}}"
+
+
 @app.get("/api/players")
 def get_all_players():
     """Get list of all connected players."""
-    return {
-        "count": len(connected_players),
-        "players": connected_players
-    }
+    players = list(connected_players.items())
+    return StreamingResponse(
+        stream_players_json(players, count=len(players)),
+        media_type="application/json",
+    )
 
 
 # ============================================================================
@@ -604,11 +744,12 @@ def get_all_players():
 @app.post("/api/player/position")
 def update_position(position: PlayerPosition):
     """Update a player's position (called frequently during gameplay)."""
-    if position.player_id not in connected_players:
+    player = connected_players.get(position.player_id)
+    if player is None:
         raise HTTPException(status_code=404, detail="Player not found")
-    
-    connected_players[position.player_id]["x"] = position.x
-    connected_players[position.player_id]["y"] = position.y
+
+    player.x = position.x
+    player.y = position.y
     
     return {"success": True}
 
@@ -616,10 +757,12 @@ def update_position(position: PlayerPosition):
 @app.post("/api/player/score")
 def update_score(score: PlayerScore):
     """Update a player's score."""
-    if score.player_id not in connected_players:
+    player = connected_players.get(score.player_id)
+    if player is None:
         raise HTTPException(status_code=404, detail="Player not found")
-    
-    connected_players[score.player_id]["score"] = score.score
+
+    player.score = score.score
+    mark_leaderboard_dirty()
     
     return {"success": True, "new_score": score.score}
 
@@ -627,29 +770,56 @@ def update_score(score: PlayerScore):
 @app.get("/api/game/state")
 def get_game_state():
     """Get the current game state (all players and their positions)."""
-    return {
-        "players": connected_players,
-        "timestamp": datetime.now().isoformat()
-    }
+    return StreamingResponse(
+        stream_players_json(
+            list(connected_players.items()),
+            timestamp=datetime.now().isoformat(),
+        ),
+        media_type="application/json",
+    )
 
 
-@app.get("/api/leaderboard")
-def get_leaderboard():
-    """Get the top 10 players by score."""
+# Spectators poll the leaderboard far more often than scores change, so the
+# top-10 payload is kept pre-serialized. Score writes only flip ``dirty``; the
+# next read rebuilds once, however many writes landed in between.
+leaderboard_cache: dict = {"body": b"", "dirty": True}
+leaderboard_cache_lock = threading.Lock()
+
+
+def mark_leaderboard_dirty() -> None:
+    """Invalidate the cached leaderboard after a score or roster change."""
+    leaderboard_cache["dirty"] = True
+
+
+def build_leaderboard() -> dict:
+    """Sort ``connected_players`` and return the top-10 payload."""
     sorted_players = sorted(
         connected_players.items(),
-        key=lambda x: x[1]["score"],
+        key=lambda x: x[1].score,
         reverse=True
     )[:10]
-    
+
     return {
         "leaderboard": [
-            {"rank": i + 1, "player_id": pid, "name": data["name"], "score": data["score"]}
+            {"rank": i + 1, "player_id": pid, "name": data.name, "score": data.score}
             for i, (pid, data) in enumerate(sorted_players)
         ]
     }
 
 
+@app.get("/api/leaderboard")
+def get_leaderboard():
+    """Get the top 10 players by score."""
+    if leaderboard_cache["dirty"]:
+        # Only one request rebuilds; the rest wait and reuse its bytes.
+        with leaderboard_cache_lock:
+            if leaderboard_cache["dirty"]:
+                # Clear first so a write racing the rebuild re-dirties it.
+                leaderboard_cache["dirty"] = False
+                leaderboard_cache["body"] = dumps_json_bytes(build_leaderboard())
+    return Response(content=leaderboard_cache["body"], media_type="application/json")
+
+
 # ============================================================================
 # Step 8: Wallet & Economy Endpoints
 # ============================================================================
@@ -706,19 +876,23 @@ def credit_wallet(request: CreditWalletRequest, db: Session = Depends(get_db)):
         "transaction_id": "pi_xxx"
     }
     """
-    wallet_row = db_get_or_create_player_wallet(db, request.player_uuid)
-    
-    if request.gold_coins > 0:
-        wallet_row.add_gold_coins(request.gold_coins)
-    
-    if request.health_packs > 0:
-        wallet_row.add_health_packs(request.health_packs)
-    
-    db.commit()
-    db.refresh(wallet_row)
-    out = wallet_row.to_dict()
+    with get_player_lock(request.player_uuid):
+        wallet_row = db_get_or_create_player_wallet(db, request.player_uuid)
+
+        if request.gold_coins > 0:
+            wallet_row.add_gold_coins(request.gold_coins)
+
+        if request.health_packs > 0:
+            wallet_row.add_health_packs(request.health_packs)
+
+        db.commit()
+        db.refresh(wallet_row)
+        out = wallet_row.to_dict()
     
-    print(f"💰 Credited {request.gold_coins} gold, {request.health_packs} health to {request.player_uuid}")
+    logger.info(
+        "💰 Credited %d gold, %d health to %s",
+        request.gold_coins, request.health_packs, request.player_uuid,
+    )
     
     return {
         "success": True,
@@ -747,13 +921,17 @@ def add_earned_coins(request: AddEarnedCoinsRequest, db: Session = Depends(get_d
     if request.amount <= 0:
         raise HTTPException(status_code=400, detail="Amount must be positive")
     
-    wallet_row = db_get_or_create_player_wallet(db, request.player_uuid)
-    wallet_row.add_gold_coins(request.amount)
-    db.commit()
-    db.refresh(wallet_row)
+    with get_player_lock(request.player_uuid):
+        wallet_row = db_get_or_create_player_wallet(db, request.player_uuid)
+        wallet_row.add_gold_coins(request.amount)
+        db.commit()
+        db.refresh(wallet_row)
+        new_balance = wallet_row.gold_coins
 
-    new_balance = wallet_row.gold_coins
-    print(f"💰 Session coins: +{request.amount} for {request.player_uuid} (balance: {new_balance})")
+    logger.info(
+        "💰 Session coins: +%d for %s (balance: %d)",
+        request.amount, request.player_uuid, new_balance,
+    )
     
     return {
         "success": True,
@@ -783,31 +961,28 @@ def sync_wallet(request: SyncWalletRequest, db: Session = Depends(get_db)):
         "session_coins_earned": 40
     }
     """
-    wallet_row = db_get_or_create_player_wallet(db, request.player_uuid)
+    with get_player_lock(request.player_uuid):
+        wallet_row = db_get_or_create_player_wallet(db, request.player_uuid)
 
-    wallet_row.gold_coins = max(wallet_row.gold_coins, request.gold_coins)
-    wallet_row.health_packs = max(wallet_row.health_packs, request.health_packs)
-    wallet_row.gems = max(wallet_row.gems, request.gems)
-    wallet_row.total_earned_coins = max(wallet_row.total_earned_coins, request.total_earned_coins)
-    wallet_row.session_coins_earned = max(0, request.session_coins_earned)
+        wallet_row.gold_coins = max(wallet_row.gold_coins, request.gold_coins)
+        wallet_row.health_packs = max(wallet_row.health_packs, request.health_packs)
+        wallet_row.gems = max(wallet_row.gems, request.gems)
+        wallet_row.total_earned_coins = max(wallet_row.total_earned_coins, request.total_earned_coins)
+        wallet_row.session_coins_earned = max(0, request.session_coins_earned)
 
-    db.commit()
-    db.refresh(wallet_row)
+        db.commit()
+        db.refresh(wallet_row)
+        out = wallet_row.to_dict()
 
     return {
         "success": True,
-        "wallet": wallet_row.to_dict(),
+        "wallet": out,
     }
 
 
-@app.get("/api/packages")
-def get_packages():
-    """
-    Get all available packages for purchase.
-    
-    Returns list of packages with pricing and rewards.
-    """
-    packages_list = [
+# The catalogue is static, so the /api/packages body is encoded once at import.
+PACKAGES_RESPONSE_JSON: bytes = dumps_json_bytes({
+    "packages": [
         {
             "id": pkg_type.value,
             "name": pkg["name"],
@@ -817,7 +992,17 @@ def get_packages():
         }
         for pkg_type, pkg in PACKAGES.items()
     ]
-    return {"packages": packages_list}
+})
+
+
+@app.get("/api/packages")
+def get_packages():
+    """
+    Get all available packages for purchase.
+    
+    Returns list of packages with pricing and rewards.
+    """
+    return Response(content=PACKAGES_RESPONSE_JSON, media_type="application/json")
 
 
 # ============================================================================
@@ -928,6 +1113,51 @@ def create_checkout_session(request: CreateCheckoutRequest, db: Session = Depend
     }
 
 
+def credit_wallet_from_webhook(
+    player_uuid: str,
+    gold_coins: int,
+    health_packs: int,
+    package_type_str: Optional[str],
+    event_id: Optional[str] = None,
+) -> None:
+    """
+    Apply a paid package to ``player_uuid``'s wallet in its own session.
+
+    Failures are raised so the webhook answers non-2xx and Stripe retries the
+    delivery. The Stripe ``event_id`` is recorded in the same commit, so a
+    retried delivery of an already credited event credits nothing.
+    """
+    with get_player_lock(player_uuid):
+        db = SessionLocal()
+        try:
+            if not record_event_once(db, event_id):
+                logger.info("🔁 Skipping duplicate webhook event %s", event_id)
+                return
+            wallet_row = db_get_or_create_player_wallet(db, player_uuid)
+            if gold_coins > 0:
+                wallet_row.add_gold_coins(gold_coins)
+            if health_packs > 0:
+                wallet_row.add_health_packs(health_packs)
+
+            if package_type_str:
+                try:
+                    pkg = PACKAGES.get(PackageType(package_type_str))
+                    if pkg:
+                        wallet_row.total_spent_usd += pkg["price"]
+                except ValueError:
+                    pass
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("⚠️ Wallet credit failed for player %s", player_uuid)
+            raise
+        finally:
+            db.close()
+
+    logger.info("✅ Credited %d gold, %d health to player %s", gold_coins, health_packs, player_uuid)
+
+
 @app.post("/api/payments/webhook")
 async def stripe_webhook(request: Request, stripe_signature: str = Header(None, alias="Stripe-Signature")):
     """
@@ -948,10 +1178,10 @@ async def stripe_webhook(request: Request, stripe_signature: str = Header(None,
     result = stripe_service.process_webhook(payload, signature)
     
     if not result.valid:
-        print(f"⚠️ Invalid webhook: {result.error}")
+        logger.warning("⚠️ Invalid webhook: %s", result.error)
         raise HTTPException(status_code=400, detail=result.error)
     
-    print(f"📨 Received webhook: {result.event_type}")
+    logger.info("📨 Received webhook: %s", result.event_type)
     
     # Handle successful payments
     if stripe_service.should_credit_player(result.event_type, result.success or False):
@@ -963,36 +1193,25 @@ async def stripe_webhook(request: Request, stripe_signature: str = Header(None,
         health_packs = int(metadata.get("health_packs", 0))
         
         if player_uuid:
-            db = SessionLocal()
+            # DB work blocks, so run it on the threadpool where the
+            # per-player thread lock can be taken without stalling the loop.
+            # A failed credit must not be acknowledged: answer 500 so Stripe
+            # retries the delivery.
             try:
-                wallet_row = db_get_or_create_player_wallet(db, player_uuid)
-                if gold_coins > 0:
-                    wallet_row.add_gold_coins(gold_coins)
-                if health_packs > 0:
-                    wallet_row.add_health_packs(health_packs)
-
-                package_type_str = metadata.get("package_type")
-                if package_type_str:
-                    try:
-                        pkg = PACKAGES.get(PackageType(package_type_str))
-                        if pkg:
-                            wallet_row.total_spent_usd += pkg["price"]
-                    except ValueError:
-                        pass
-
-                db.commit()
-            except Exception as exc:
-                db.rollback()
-                print(f"⚠️ Wallet credit failed: {exc}")
-                raise
-            finally:
-                db.close()
-
-            print(f"✅ Credited {gold_coins} gold, {health_packs} health to player {player_uuid}")
+                await run_in_threadpool(
+                    credit_wallet_from_webhook,
+                    player_uuid,
+                    gold_coins,
+                    health_packs,
+                    metadata.get("package_type"),
+                    result.event_id,
+                )
+            except Exception:
+                raise HTTPException(status_code=500, detail="Wallet credit failed; retry later")
     
     # Handle failed payments
     if result.event_type in ["payment_intent.payment_failed", "payment_intent.canceled"]:
-        print(f"❌ Payment failed: {result.payment_intent_id}")
+        logger.info("❌ Payment failed: %s", result.payment_intent_id)
     
     return {"received": True, "event_type": result.event_type}
 
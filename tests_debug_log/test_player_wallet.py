@@ -25,6 +25,7 @@ What we verify
 """
 from __future__ import annotations
 
+import asyncio
 import os
 import sys
 import unittest
@@ -344,5 +345,102 @@ class PlayerIPRecordModelTestCase(unittest.TestCase):
             db.close()
 
 
+class PlayerListStreamingTestCase(unittest.TestCase):
+    """The streamed player-list endpoints must still produce valid JSON."""
+
+    def setUp(self):
+        self.client = TestClient(server_module.app)
+        server_module.connected_players.clear()
+
+    def tearDown(self):
+        self.client.close()
+        server_module.connected_players.clear()
+
+    def test_players_endpoint_streams_full_map(self):
+        server_module.connected_players["p1"] = server_module.ConnectedPlayer("Astra", 1, 2, 5, "t")
+        server_module.connected_players["p2"] = server_module.ConnectedPlayer("Rook", 3, 4, 9, "t")
+
+        resp = self.client.get("/api/players")
+        self.assertEqual(resp.status_code, 200)
+        payload = resp.json()
+        self.assertEqual(payload["count"], 2)
+        self.assertEqual(
+            payload["players"],
+            {
+                "p1": {"name": "Astra", "x": 1, "y": 2, "score": 5, "joined_at": "t"},
+                "p2": {"name": "Rook", "x": 3, "y": 4, "score": 9, "joined_at": "t"},
+            },
+        )
+
+    def test_large_player_list_is_gzipped(self):
+        for i in range(50):
+            server_module.connected_players[f"p{i}"] = server_module.ConnectedPlayer(f"Pilot{i}")
+
+        resp = self.client.get("/api/players", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers.get("content-encoding"), "gzip")
+        self.assertEqual(resp.json()["count"], 50)
+
+    def test_many_players_stream_in_batches(self):
+        count = server_module.PLAYER_STREAM_BATCH * 2 + 7
+        for i in range(count):
+            server_module.connected_players[f"p{i}"] = server_module.ConnectedPlayer(f"Pilot{i}", i, i, i, "t")
+
+        resp = self.client.get("/api/players")
+        self.assertEqual(resp.status_code, 200)
+        payload = resp.json()
+        self.assertEqual(payload["count"], count)
+        self.assertEqual(len(payload["players"]), count)
+        self.assertEqual(
+            payload["players"][f"p{count - 1}"],
+            {"name": f"Pilot{count - 1}", "x": count - 1, "y": count - 1, "score": count - 1, "joined_at": "t"},
+        )
+
+        async def collect():
+            return [chunk async for chunk in server_module.stream_players_json(
+                list(server_module.connected_players.items()), count=count
+            )]
+
+        # head + one chunk per batch + closing braces
+        chunks = asyncio.run(collect())
+        self.assertEqual(len(chunks), 2 + 3)
+
+    def test_game_state_empty(self):
+        resp = self.client.get("/api/game/state")
+        self.assertEqual(resp.status_code, 200)
+        payload = resp.json()
+        self.assertEqual(payload["players"], {})
+        self.assertIn("timestamp", payload)
+
+
+class LeaderboardCacheTestCase(unittest.TestCase):
+    """The pre-serialized leaderboard must track score writes."""
+
+    def setUp(self):
+        self.client = TestClient(server_module.app)
+        server_module.connected_players.clear()
+        server_module.mark_leaderboard_dirty()
+
+    def tearDown(self):
+        self.client.close()
+        server_module.connected_players.clear()
+        server_module.mark_leaderboard_dirty()
+
+    def test_score_update_invalidates_cached_leaderboard(self):
+        server_module.connected_players["a"] = server_module.ConnectedPlayer("A", score=10)
+        server_module.connected_players["b"] = server_module.ConnectedPlayer("B", score=5)
+        server_module.mark_leaderboard_dirty()
+
+        first = self.client.get("/api/leaderboard").json()["leaderboard"]
+        self.assertEqual([e["player_id"] for e in first], ["a", "b"])
+
+        resp = self.client.post("/api/player/score", json={"player_id": "b", "score": 50})
+        self.assertEqual(resp.status_code, 200)
+
+        second = self.client.get("/api/leaderboard").json()["leaderboard"]
+        self.assertEqual([e["player_id"] for e in second], ["b", "a"])
+        self.assertEqual(second[0]["score"], 50)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -215,6 +215,27 @@ class TestProcessWebhookNotification(DBTestCase):
         wallet = txn.player.wallet
         self.assertEqual(wallet.gold_coins, 0)
 
+    def test_repeated_event_id_is_skipped(self):
+        txn = self.create_pending_transaction()
+
+        self.mock_stripe.process_webhook.return_value = StripeWebhookResult(
+            valid=True,
+            event_id="evt_100",
+            event_type="payment_intent.succeeded",
+            payment_intent_id="pi_100",
+            merchant_reference="ref_100",
+            success=True,
+            raw_data={"id": "pi_100"},
+        )
+
+        self.handler.process_webhook_notification(self.db, b"payload", "sig")
+        ok, msg = self.handler.process_webhook_notification(self.db, b"payload", "sig")
+
+        self.assertTrue(ok)
+        self.assertIn("Duplicate event", msg)
+        self.db.refresh(txn)
+        self.assertEqual(txn.player.wallet.gold_coins, 100)
+
     def test_failed_payment_sets_error(self):
         txn = self.create_pending_transaction()
 
@@ -268,6 +289,34 @@ class TestProcessWebhookNotification(DBTestCase):
         self.assertTrue(ok)
         self.assertIn("Transaction not found", msg)
 
+    def test_batch_credits_each_transaction_once(self):
+        txn = self.create_pending_transaction()
+        succeeded = StripeWebhookResult(
+            valid=True,
+            event_type="payment_intent.succeeded",
+            payment_intent_id="pi_100",
+            merchant_reference="ref_100",
+            success=True,
+            raw_data={"id": "pi_100"},
+        )
+        self.mock_stripe.process_webhook.side_effect = [
+            succeeded,
+            succeeded,
+            StripeWebhookResult(valid=False, error="Signature verification failed"),
+        ]
+        self.mock_stripe.get_transaction_status_from_event.return_value = TransactionStatus.CAPTURED
+        self.mock_stripe.should_credit_player.return_value = True
+
+        results = self.handler.process_webhook_batch(
+            self.db, [(b"a", "sig"), (b"b", "sig"), (b"c", "bad")]
+        )
+
+        self.assertEqual([ok for ok, _ in results], [True, True, False])
+        self.assertIn("Already processed", results[1][1])
+        self.db.refresh(txn)
+        self.assertEqual(txn.status, TransactionStatus.CAPTURED)
+        self.assertEqual(txn.player.wallet.gold_coins, 100)
+
 
 class TestVerifyPaymentResult(DBTestCase):
 
@@ -346,6 +395,70 @@ class TestGetAvailablePackages(DBTestCase):
         self.assertIn("gold_1200", ids)
 
 
+class TestCustomerCache(unittest.TestCase):
+
+    @patch("stripe.PaymentIntent.create")
+    @patch("stripe.Customer.create")
+    @patch("stripe.Customer.list")
+    def test_repeat_email_skips_customer_lookup(self, mock_list, mock_create, mock_intent):
+        mock_list.return_value = MagicMock(data=[MagicMock(id="cus_123")])
+        mock_intent.return_value = MagicMock(id="pi_1", client_secret="secret")
+
+        service = StripePaymentService(api_key="sk_test_fake")
+        for _ in range(3):
+            result = service.create_payment_intent(
+                "player-1", PackageType.STARTER, customer_email="a@example.com"
+            )
+            self.assertTrue(result.success)
+
+        mock_list.assert_called_once()
+        mock_create.assert_not_called()
+        self.assertEqual(mock_intent.call_args.kwargs["customer"], "cus_123")
+
+
+class TestWebhookCreditFailure(DBTestCase):
+    """A wallet credit that fails must not be acknowledged to Stripe."""
+
+    def setUp(self):
+        super().setUp()
+        import server
+        from fastapi.testclient import TestClient
+
+        self.server = server
+        self.client = TestClient(server.app)
+        self.event = StripeWebhookResult(
+            valid=True,
+            event_id="evt_fail_1",
+            event_type="checkout.session.completed",
+            success=True,
+            raw_data={"metadata": {"player_uuid": "player-abc-1234", "gold_coins": "500"}},
+        )
+
+    def test_credit_error_is_raised(self):
+        self.seed_player()
+        with patch.object(self.server, "SessionLocal", self.Session), \
+             patch.object(self.server, "db_get_or_create_player_wallet", side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                self.server.credit_wallet_from_webhook("player-abc-1234", 500, 0, None, "evt_fail_1")
+
+    def test_webhook_returns_500_when_credit_fails(self):
+        with patch.object(self.server.stripe_service, "process_webhook", return_value=self.event), \
+             patch.object(self.server, "credit_wallet_from_webhook", side_effect=RuntimeError("db down")):
+            response = self.client.post(
+                "/api/payments/webhook", content=b"{}", headers={"Stripe-Signature": "sig"}
+            )
+        self.assertEqual(response.status_code, 500)
+
+    def test_webhook_acknowledges_after_credit(self):
+        with patch.object(self.server.stripe_service, "process_webhook", return_value=self.event), \
+             patch.object(self.server, "credit_wallet_from_webhook") as mock_credit:
+            response = self.client.post(
+                "/api/payments/webhook", content=b"{}", headers={"Stripe-Signature": "sig"}
+            )
+        self.assertEqual(response.status_code, 200)
+        mock_credit.assert_called_once_with("player-abc-1234", 500, 0, None, "evt_fail_1")
+
+
 class TestPeriodicAPIConnectionCheck(unittest.TestCase):
     """
     Simulates a periodic health check that verifies the Stripe API